@@ -4,6 +4,11 @@ from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DUCKOSM_CONFIG_DIR = PROJECT_ROOT / "tools/duckOSM/config"
 SHORTCUT_CONFIG_DIR = PROJECT_ROOT / "tools/shortcut-generator/config"
@@ -13,7 +18,7 @@ DATASETS_FILE = PROJECT_ROOT / "services/api-gateway/config/datasets.yaml"
 
 def load_sources():
     with open(SOURCES_FILE) as f:
-        return yaml.safe_load(f)["sources"]
+        return yaml.load(f, Loader=_YamlLoader)["sources"]
 
 
 def create_duckosm_config(city: str):
@@ -24,7 +29,7 @@ def create_duckosm_config(city: str):
 
     default_file = DUCKOSM_CONFIG_DIR / "default.yaml"
     with open(default_file) as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     config["name"] = city
     config["pbf_path"] = f"data/maps/{city}.osm.pbf"
@@ -45,7 +50,7 @@ def create_shortcut_config(city: str):
 
     default_file = SHORTCUT_CONFIG_DIR / "default_duckdb.yaml"
     with open(default_file) as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     config["input"]["name"] = city
     config["input"]["database_path"] = "../../data"
@@ -58,7 +63,7 @@ def create_shortcut_config(city: str):
 
 def register_dataset(city: str, place: str):
     with open(DATASETS_FILE) as f:
-        datasets_config = yaml.safe_load(f)
+        datasets_config = yaml.load(f, Loader=_YamlLoader)
 
     existing = [d["name"] for d in datasets_config["datasets"]]
     if city in existing:
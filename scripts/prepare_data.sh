@@ -52,6 +52,18 @@ else
         --output "$BOUNDARY_FILE"
 fi
 
+# 1b. Pre-tile the boundary for the web UI (optional; needs tippecanoe >= 2.17)
+BOUNDARY_TILES="${BOUNDARY_FILE%.geojson}.pmtiles"
+if ! command -v tippecanoe > /dev/null; then
+    echo "[1/4] tippecanoe not found, the UI will draw the GeoJSON boundary"
+elif [ "$BOUNDARY_TILES" -nt "$BOUNDARY_FILE" ]; then
+    echo "[1/4] Boundary tiles are up to date, skipping..."
+else
+    echo "[1/4] Building boundary vector tiles..."
+    tippecanoe -zg -l boundary --drop-densest-as-needed --force \
+        -o "$BOUNDARY_TILES" "$BOUNDARY_FILE"
+fi
+
 # 2. Download regional PBF
 if [ -f "$REGION_PBF" ]; then
     echo "[2/4] Regional PBF already exists, skipping..."
@@ -1,8 +1,67 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
 import requests
-import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import List, Dict
-from dataclasses import dataclass
+from typing import List, Dict, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+except ImportError:  # optional speedup, falls back to the stdlib json module
+    orjson = None
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize a request body to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(content: bytes):
+    """Decode a JSON response body (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _list_dir(path) -> set:
+    """Names of the entries in a directory (one scandir call), or an empty set."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+# Retry refused connections briefly, for any method: the request never reached
+# the server. Proxy 502/504s are retried for GET only, since a POST may already
+# have been processed. 503 is left alone: the engine uses it for "dataset not
+# loaded", which a retry won't fix.
+_RETRY = Retry(
+    total=2,
+    read=0,
+    backoff_factor=0.05,
+    status_forcelist=(502, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+
+# Shared stand-in for missing nested objects in responses (never mutated)
+_EMPTY: Dict = {}
+
+# base_url -> is_gateway, shared by every RoutingClient in the process
+_GATEWAY_PROBE_CACHE: Dict[str, bool] = {}
 
 
 @dataclass
@@ -15,28 +74,202 @@ class RouteResponse:
     geojson: Dict = None
     error: str = None
     alternative_route: Dict = None  # Alternative route if requested
+    _path_array: object = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def cost(self) -> float:
         """Alias for distance, representing the total path cost."""
         return self.distance
 
+    @property
+    def path_array(self):
+        """
+        The path as a contiguous numpy uint32 array (the engine's edge id type).
+
+        Built once on first access; requires numpy. Returns None if there is no path.
+        """
+        if self._path_array is None and self.path is not None:
+            import numpy as np
+            self._path_array = np.asarray(self.path, dtype=np.uint32)
+        return self._path_array
+
 class RoutingClient:
     """
     Client for the Routing Platform C++ Engine.
+
+    Requests share one pooled keep-alive session; call close() (or use the
+    client as a context manager) to release it.
+
+    The *_async methods (route_async, nearest_edges_async,
+    route_by_edge_async) run on an httpx.AsyncClient so many queries can be
+    awaited concurrently with asyncio.gather. They need the optional
+    ``httpx`` dependency (``pip install h3_routing_client[async]``); release
+    them with ``await client.aclose()`` or ``async with``. With
+    ``http2=True`` (``pip install h3_routing_client[http2]``) they are
+    multiplexed over one HTTP/2 connection when the server offers it.
+
+    submit_route() queues edge-to-edge queries for a background thread that
+    sends everything submitted within batch_window_ms (up to max_batch
+    queries) as one /route_batch request.
     """
-    def __init__(self, base_url: str = "http://localhost:8082", config_path: str = None):
+    batch_window_ms = 5
+    max_batch = 64
+    # nearest_edges() results kept, keyed by (dataset, lat, lon rounded to 1e-6, k, radius)
+    nearest_cache_size = 4096
+
+    def __init__(self, base_url: str = "http://localhost:8082", config_path: str = None, http2: bool = False):
         self.base_url = base_url.rstrip("/")
-        self.is_gateway = self._check_is_gateway()
-        self.config_path = config_path
-        self.dataset_registry = {}
+        # Endpoints that are the same on the gateway and the engine, built once
+        self._url_route = self.base_url + "/route"
+        self._url_route_batch = self.base_url + "/route_batch"
+        self._url_route_by_edge = self.base_url + "/route_by_edge"
+        self._url_nearest = self.base_url + "/nearest_edges"
+        # Negotiate HTTP/2 on the async client (needs h2 and an h2-capable TLS front end)
+        self.http2 = http2
+        
+        # One keep-alive connection pool for every request made by this client
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=64, max_retries=_RETRY)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Advertise every content-encoding urllib3 can decode here (gzip/deflate,
+        # plus br/zstd when brotli/zstandard are installed)
+        self._session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        # httpx.AsyncClient for the *_async methods, created on first use
+        self._async_client = None
+        # (monotonic timestamp, response) of the last health check
+        self._health_cache = None
+        # submit_route() queue and its worker thread, started on first use
+        self._batch_queue = None
+        self._batch_thread = None
+        self._batch_lock = threading.Lock()
+        # Datasets this client has successfully loaded (canonical names)
+        self._loaded_on_server = set()
+        # LRU of nearest_edges() results
+        self._nearest_cache = OrderedDict()
+        self._nearest_lock = threading.Lock()
         
-        # If not connected to gateway, try to load local config to support by-name loading
-        if not self.is_gateway:
-            self._try_load_local_config()
+        # Gateway probe and local datasets.yaml are both resolved on first use
+        self._is_gateway_cached = None
+        self.config_path = config_path
+        self._dataset_registry = None
+        # Case-insensitive name / short_name -> registry entry, built with the registry
+        self._by_lower_name = {}
+        self._by_lower_short_name = {}
+
+    @property
+    def is_gateway(self) -> bool:
+        """True if base_url is the API Gateway (probed on first access)."""
+        if self._is_gateway_cached is None:
+            # An inconclusive probe is remembered by this client only, so
+            # reads of is_gateway don't each pay a probe timeout
+            self._is_gateway_cached = self._check_is_gateway()
+        return self._is_gateway_cached
+
+    @is_gateway.setter
+    def is_gateway(self, value: bool):
+        self._is_gateway_cached = value
+
+    @property
+    def dataset_registry(self) -> Dict[str, Dict]:
+        """Datasets from the local datasets.yaml, used for by-name loading against the engine."""
+        if self._dataset_registry is None:
+            self._dataset_registry = {}
+            # If not connected to gateway, try to load local config to support by-name loading
+            if not self.is_gateway:
+                self._try_load_local_config()
+            for key, ds in self._dataset_registry.items():
+                self._by_lower_name.setdefault(key.lower(), ds)
+                if ds.get('short_name'):
+                    self._by_lower_short_name.setdefault(ds['short_name'].lower(), ds)
+        return self._dataset_registry
+
+    def clear_cache(self):
+        """Drop cached nearest_edges() results."""
+        with self._nearest_lock:
+            self._nearest_cache.clear()
+
+    def _nearest_cache_get(self, key):
+        with self._nearest_lock:
+            edges = self._nearest_cache.get(key)
+            if edges is not None:
+                self._nearest_cache.move_to_end(key)
+            return edges
+
+    def _nearest_cache_put(self, key, edges: List[Dict]):
+        with self._nearest_lock:
+            self._nearest_cache[key] = edges
+            self._nearest_cache.move_to_end(key)
+            if len(self._nearest_cache) > self.nearest_cache_size:
+                self._nearest_cache.popitem(last=False)
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        with self._batch_lock:
+            if self._batch_thread is not None:
+                # Sentinel: the worker flushes what is queued ahead of it, then exits
+                self._batch_queue.put(None)
+                self._batch_thread.join()
+                self._batch_thread = None
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def aclose(self):
+        """Close the sync session and the async client, if one was created."""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def _get_async_client(self):
+        """Create the shared httpx.AsyncClient on first use."""
+        if self._async_client is None:
+            try:
+                import httpx
+            except ImportError as e:
+                raise ImportError(
+                    "Async methods require httpx: pip install h3_routing_client[async]"
+                ) from e
+            self._async_client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._async_client
+
+    def _request(self, method: str, url: str, payload: Dict = None, **kwargs) -> requests.Response:
+        """Send a request on the pooled session, encoding ``payload`` as the JSON body."""
+        if payload is not None:
+            kwargs["data"] = _json_dumps(payload)
+            kwargs["headers"] = _JSON_HEADERS
+        return self._session.request(method, url, **kwargs)
+
+    async def _arequest(self, method: str, url: str, payload: Dict = None, **kwargs):
+        """Async counterpart of _request() on the shared httpx.AsyncClient."""
+        if payload is not None:
+            kwargs["content"] = _json_dumps(payload)
+            kwargs["headers"] = _JSON_HEADERS
+        return await self._get_async_client().request(method, url, **kwargs)
 
     def _try_load_local_config(self):
         """Try to locate and load datasets.yaml for local path resolution."""
+        # Imported here so gateway-only clients never load PyYAML
+        import yaml
+        try:
+            from yaml import CSafeLoader as YamlLoader  # libyaml-backed
+        except ImportError:
+            from yaml import SafeLoader as YamlLoader
+
         candidates = []
         if self.config_path:
             candidates.append(Path(self.config_path))
@@ -44,31 +277,36 @@ class RoutingClient:
         # Common locations relative to this SDK file or project root
         sdk_dir = Path(__file__).parent.absolute()
         
-        # Heuristic: Walk up parents to find 'h3-routing-platform'
-        project_root = sdk_dir
-        for parent in sdk_dir.parents:
-            if parent.name == 'h3-routing-platform':
-                project_root = parent
-                break
+        # Heuristic: innermost 'h3-routing-platform' directory above the SDK
+        marker = f"{os.sep}h3-routing-platform{os.sep}"
+        sdk_str = os.fspath(sdk_dir)
+        idx = sdk_str.rfind(marker)
+        if idx != -1:
+            project_root = Path(sdk_str[:idx + len(marker) - 1])
         else:
-             # Fallback if not found in parents (e.g. symlinked/editable install weirdness)
-             # Try assuming standard layout: sdk/python/client.py -> ../.. -> project_root
-             project_root = sdk_dir.parents[1]
+            # Fallback if not found in parents (e.g. symlinked/editable install weirdness)
+            # Try assuming standard layout: sdk/python/client.py -> ../.. -> project_root
+            project_root = sdk_dir.parents[1]
 
         candidates.extend([
             project_root / "services/api-gateway/config/datasets.yaml",
             Path("config/datasets.yaml"),
             Path("../config/datasets.yaml"),
-            Path("../services/api-gateway/config/datasets.yaml"),
-             # Hardcoded absolute fallback for reliability
             Path("../services/api-gateway/config/datasets.yaml")
         ])
+        # Drop repeats (config_path may point at one of the defaults)
+        seen = set()
+        candidates = [c for c in candidates if not (str(c) in seen or seen.add(str(c)))]
         
+        # List each candidate directory once instead of stat()-ing every path
+        listings = {}
         for p in candidates:
-            if p.exists():
+            if p.parent not in listings:
+                listings[p.parent] = _list_dir(p.parent)
+            if p.name in listings[p.parent]:
                 try:
                     with open(p, 'r') as f:
-                        config = yaml.safe_load(f)
+                        config = yaml.load(f, Loader=YamlLoader)
                         
                     # Pre-resolve paths
                     # If we found it at the hardcoded path, Force project root to be that path's grandparent
@@ -79,10 +317,13 @@ class RoutingClient:
                     data_root = data_root.replace('{project_root}', str(project_root))
                     
                     datasets = config.get('datasets', [])
+                    # Listed once; db names below are resolved against it without stat()s
+                    db_files = _list_dir(data_root)
+                    db_files_ci = {f.lower(): f for f in db_files if f.endswith('.db')}
                     
                     for ds in datasets:
                         name = ds['name']
-                        self.dataset_registry[name] = ds
+                        self._dataset_registry[name] = ds
                         
                         # automatic deduction of db_path if missing
                         if 'db_path' not in ds:
@@ -93,12 +334,11 @@ class RoutingClient:
                                  f"{name.title()}.db"
                              ]
                              
-                             for db_name in candidates_db:
-                                 path_candidate = Path(data_root) / db_name
-                                 if path_candidate.exists():
-                                     ds['db_path'] = str(path_candidate)
-                                     print(f"DEBUG: Auto-deduced db_path for '{name}': {ds['db_path']}")
-                                     break
+                             found = next((d for d in candidates_db if d in db_files),
+                                          db_files_ci.get(f"{name.lower()}.db"))
+                             if found is not None:
+                                 ds['db_path'] = str(Path(data_root) / found)
+                                 print(f"DEBUG: Auto-deduced db_path for '{name}': {ds['db_path']}")
                         
                         # Resolve {data_root} in db_path if it exists
                         if 'db_path' in ds:
@@ -107,25 +347,65 @@ class RoutingClient:
                             if not Path(ds['db_path']).is_absolute():
                                 ds['db_path'] = str(project_root / ds['db_path'])
                                 
-                    print(f"Loaded local config from {p} with {len(self.dataset_registry)} datasets")
+                    print(f"Loaded local config from {p} with {len(self._dataset_registry)} datasets")
                     break
                 except Exception as e:
                     print(f"Warning: Failed to load config from {p}: {e}")
 
     def _check_is_gateway(self) -> bool:
         """Check if connected to API Gateway (vs C++ Engine directly)."""
+        cached = _GATEWAY_PROBE_CACHE.get(self.base_url)
+        if cached is not None:
+            return cached
         try:
             # Gateway has /server-status, Engine has /health
-            resp = requests.get(f"{self.base_url}/server-status", timeout=1)
-            return resp.status_code == 200
+            resp = self._request("GET", f"{self.base_url}/server-status", timeout=1)
         except Exception:
+            # Unreachable: not cached process-wide, the server may just not be up yet
             return False
+        return self._record_server_status(resp)
 
-    def health(self) -> Dict:
-        """Check server health."""
-        if self.is_gateway:
-            return requests.get(f"{self.base_url}/server-status").json()
-        return requests.get(f"{self.base_url}/health").json()
+    def _record_server_status(self, resp: requests.Response) -> bool:
+        """
+        Settle is_gateway from a /server-status response: only the gateway
+        serves it. A gateway's answer is also kept as the health() result.
+
+        Only a definite answer (200: gateway, 404: engine) is shared with other
+        clients; any other status (a proxy's 502/503) is treated like an
+        unreachable server and settles this client only.
+        """
+        is_gateway = resp.status_code == 200
+        if resp.status_code in (200, 404):
+            _GATEWAY_PROBE_CACHE[self.base_url] = is_gateway
+        self._is_gateway_cached = is_gateway
+        if is_gateway:
+            self._health_cache = (time.monotonic(), _json_loads(resp.content))
+        return is_gateway
+
+    def health(self, max_age: float = 1.0) -> Dict:
+        """
+        Check server health.
+
+        The response is reused for ``max_age`` seconds so loops that check
+        health before every query don't pay a round-trip each time. Loading
+        or unloading a dataset invalidates it; pass max_age=0 to force a fresh check.
+        """
+        now = time.monotonic()
+        if self._health_cache is not None and now - self._health_cache[0] < max_age:
+            return self._health_cache[1]
+        if self._is_gateway_cached is None and self.base_url not in _GATEWAY_PROBE_CACHE:
+            # Mode not known yet: the gateway health call doubles as the probe,
+            # and only an engine (404) costs a second request
+            if self._record_server_status(self._request("GET", f"{self.base_url}/server-status")):
+                return self._health_cache[1]
+        endpoint = "/server-status" if self.is_gateway else "/health"
+        data = _json_loads(self._request("GET", f"{self.base_url}{endpoint}").content)
+        self._health_cache = (now, data)
+        return data
+
+    def loaded_datasets(self, max_age: float = 1.0) -> List[str]:
+        """Names of the datasets currently loaded on the server (uses the health cache)."""
+        return list(self.health(max_age).get("datasets_loaded", []))
 
     def route(
         self, 
@@ -136,7 +416,8 @@ class RoutingClient:
         num_candidates: int = 3,
         algorithm: str = "pruned",
         include_alternative: bool = False,
-        penalty_factor: float = 2.0
+        penalty_factor: float = 2.0,
+        include_geojson: bool = True
     ) -> RouteResponse:
         """
         Calculate a route between two points.
@@ -151,6 +432,8 @@ class RoutingClient:
                        "bi_lca_sp", "uni_lca_sp", "m2m_classic_sp", "dijkstra_sp")
             include_alternative: If True, also return an alternative route
             penalty_factor: Penalty multiplier for alternative route (default 2.0)
+            include_geojson: If False, the server skips building the route geometry
+                             and geojson is None (use when only distance/path are needed)
 
         Returns:
             RouteResponse object containing:
@@ -160,6 +443,30 @@ class RoutingClient:
                 - geojson: Route geometry
                 - alternative_route: Dict with alternative route info (if requested)
         """
+        method, url, kwargs = self._route_request(
+            dataset, start_lat, start_lng, end_lat, end_lng,
+            mode, num_candidates, algorithm, include_alternative, penalty_factor,
+            include_geojson
+        )
+        try:
+            resp = self._request(method, url, timeout=10, **kwargs)
+            return self._parse_route(_json_loads(resp.content), include_geojson)
+        except Exception as e:
+            return RouteResponse(success=False, error=str(e))
+
+    def _route_request(
+        self,
+        dataset: str,
+        start_lat: float, start_lng: float,
+        end_lat: float, end_lng: float,
+        mode: str,
+        num_candidates: int,
+        algorithm: str,
+        include_alternative: bool,
+        penalty_factor: float,
+        include_geojson: bool = True
+    ) -> Tuple[str, str, Dict]:
+        """Build the (method, url, request kwargs) for a route query."""
         # API Gateway (Project OSRM style)
         if self.is_gateway:
             params = {
@@ -171,60 +478,55 @@ class RoutingClient:
                 "search_radius": 2000.0,
                 "algorithm": algorithm,
                 "include_alternative": include_alternative,
-                "penalty_factor": penalty_factor
+                "penalty_factor": penalty_factor,
+                "include_geojson": include_geojson
             }
-            try:
-                resp = requests.get(f"{self.base_url}/route", params=params, timeout=10)
-                data = resp.json()
-                
-                if not data.get("success"):
-                     return RouteResponse(success=False, error=data.get("error"))
-                
-                return RouteResponse(
-                    success=True,
-                    distance=data.get("distance"),
-                    distance_meters=data.get("distance_meters"),
-                    runtime_ms=data.get("runtime_ms"),
-                    path=data.get("path"),
-                    geojson=data.get("geojson"),
-                    error=data.get("error"),
-                    alternative_route=data.get("alternative_route")
-                )
-            except Exception as e:
-                return RouteResponse(success=False, error=str(e))
-                
+            return "GET", self._url_route, {"params": params}
+
         # C++ Engine (Direct POST)
-        else:
-            payload = {
-                "dataset": dataset,
-                "start_lat": start_lat, "start_lng": start_lng,
-                "end_lat": end_lat, "end_lng": end_lng,
-                "mode": mode,
-                "num_candidates": num_candidates,
-                "algorithm": algorithm,
-                "include_alternative": include_alternative,
-                "penalty_factor": penalty_factor
-            }
-            
-            try:
-                resp = requests.post(f"{self.base_url}/route", json=payload, timeout=10)
-                data = resp.json()
-                
-                if not data.get("success"):
-                    return RouteResponse(success=False, error=data.get("error"))
-                    
-                r = data.get("route", {})
-                return RouteResponse(
-                    success=True,
-                    distance=r.get("distance"),
-                    distance_meters=r.get("distance_meters"),
-                    runtime_ms=data.get("timing_breakdown", {}).get("total_ms", 0),
-                    path=r.get("path"),
-                    geojson=r.get("geojson"),
-                    alternative_route=data.get("alternative_route")
-                )
-            except Exception as e:
-                return RouteResponse(success=False, error=str(e))
+        payload = {
+            "dataset": dataset,
+            "start_lat": start_lat, "start_lng": start_lng,
+            "end_lat": end_lat, "end_lng": end_lng,
+            "mode": mode,
+            "num_candidates": num_candidates,
+            "algorithm": algorithm,
+            "include_alternative": include_alternative,
+            "penalty_factor": penalty_factor,
+            "include_geojson": include_geojson
+        }
+        return "POST", self._url_route, {"payload": payload}
+
+    def _parse_route(self, data: Dict, include_geojson: bool = True) -> RouteResponse:
+        """Convert a gateway or engine route response into a RouteResponse."""
+        if not data.get("success"):
+            return RouteResponse(success=False, error=data.get("error"))
+
+        get = data.get
+        # API Gateway returns a flat structure
+        if self.is_gateway:
+            return RouteResponse(
+                success=True,
+                distance=get("distance"),
+                distance_meters=get("distance_meters"),
+                runtime_ms=get("runtime_ms"),
+                path=get("path"),
+                geojson=get("geojson") if include_geojson else None,
+                error=get("error"),
+                alternative_route=get("alternative_route")
+            )
+
+        # C++ Engine nests the route under "route"
+        rget = (get("route") or _EMPTY).get
+        return RouteResponse(
+            success=True,
+            distance=rget("distance"),
+            distance_meters=rget("distance_meters"),
+            runtime_ms=(get("timing_breakdown") or _EMPTY).get("total_ms", 0),
+            path=rget("path"),
+            geojson=rget("geojson") if include_geojson else None,
+            alternative_route=get("alternative_route")
+        )
 
     def route_unidirectional(
         self,
@@ -250,34 +552,31 @@ class RoutingClient:
         name: str, 
         shortcuts_path: str = None, 
         edges_path: str = None,
-        db_path: str = None
+        db_path: str = None,
+        force: bool = False
     ) -> bool:
         """
         Load a dataset into the engine.
         
+        A dataset this client already loaded is not sent again; pass
+        force=True to reload it (e.g. after another client unloaded it).
+        
         Args:
             name: Dataset name identifier
             shortcuts_path: Path to shortcuts file (Legacy)
             edges_path: Path to edges CSV/Parquet (Legacy)
             db_path: Path to DuckDB database (Preferred for CSR engine)
+            force: Send the load request even if this client loaded it before
         """
         payload = {"dataset": name}
         
         # If no paths provided and not using gateway, try to resolve from local config
         if not self.is_gateway and not (db_path or (shortcuts_path and edges_path)):
-            # Try exact match
-            info = self.dataset_registry.get(name)
-            
-            # Try lowercase match
-            if not info:
-                info = self.dataset_registry.get(name.lower())
-                
-            # Try matching by short_name (case-insensitive)
-            if not info:
-                for ds in self.dataset_registry.values():
-                    if ds.get('short_name', '').lower() == name.lower():
-                        info = ds
-                        break
+            # Exact name, then name and short_name case-insensitively
+            lower = name.lower()
+            info = (self.dataset_registry.get(name)
+                    or self._by_lower_name.get(lower)
+                    or self._by_lower_short_name.get(lower))
             
             if info:
                 # Use the resolved name (e.g. "somerset" instead of "Somerset")
@@ -301,19 +600,31 @@ class RoutingClient:
         if edges_path:
             payload["edges_path"] = edges_path
             
+        if not force and payload["dataset"] in self._loaded_on_server:
+            return True
         endpoint = "/load-dataset" if self.is_gateway else "/load_dataset"
+        self._health_cache = None
+        self.clear_cache()
         try:
-            resp = requests.post(f"{self.base_url}{endpoint}", json=payload)
-            return resp.status_code == 200
+            resp = self._request("POST", f"{self.base_url}{endpoint}", payload)
         except Exception:
             return False
+        if resp.status_code == 200:
+            self._loaded_on_server.add(payload["dataset"])
+            return True
+        return False
 
     def unload_dataset(self, name: str) -> bool:
         """Unload a dataset from engine memory."""
         payload = {"dataset": name}
         endpoint = "/unload-dataset" if self.is_gateway else "/unload_dataset"
+        self._health_cache = None
+        self.clear_cache()
+        # Forget it whatever the outcome; the next load_dataset asks the server again
+        lower = name.lower()
+        self._loaded_on_server = {n for n in self._loaded_on_server if n.lower() != lower}
         try:
-            resp = requests.post(f"{self.base_url}{endpoint}", json=payload)
+            resp = self._request("POST", f"{self.base_url}{endpoint}", payload)
             return resp.status_code == 200
         except Exception:
             return False
@@ -324,7 +635,8 @@ class RoutingClient:
         lat: float,
         lon: float,
         k: int = 5,
-        radius_meters: float = 100.0
+        radius_meters: float = 100.0,
+        cache: bool = True
     ) -> List[Dict]:
         """
         Find the nearest graph edges to a location.
@@ -334,10 +646,267 @@ class RoutingClient:
             lat, lon: Query coordinates
             k: Number of nearest edges to return
             radius_meters: Maximum search radius
+            cache: Reuse the result of an earlier query for the same point
+                (to 6 decimals, ~11 cm) instead of asking the server again
             
         Returns:
             List of dicts with edge_id, distance, length, cost
         """
+        key = (dataset, round(lat, 6), round(lon, 6), k, radius_meters)
+        if cache:
+            edges = self._nearest_cache_get(key)
+            if edges is not None:
+                return edges
+        params = {
+            "dataset": dataset,
+            "lat": lat,
+            "lon": lon,
+            "k": k,
+            "radius": radius_meters
+        }
+        try:
+            resp = self._request("GET", self._url_nearest, params=params, timeout=5)
+            data = _json_loads(resp.content)
+        except Exception:
+            return []
+        edges = data.get("edges", [])
+        if resp.status_code == 200:
+            self._nearest_cache_put(key, edges)
+        return edges
+
+    def route_many(
+        self,
+        dataset: str,
+        pairs: List[Tuple[int, int]],
+        algorithm: str = "pruned",
+        include_geojson: bool = False,
+        max_concurrency: int = 16
+    ) -> List[RouteResponse]:
+        """
+        Route many (source_edge, target_edge) pairs in a single request.
+
+        Sends one POST /route_batch instead of one request per pair, so the
+        HTTP round-trip and JSON parse are paid once for the whole batch.
+        Servers without /route_batch get the pairs as concurrent
+        /route_by_edge requests instead.
+
+        Args:
+            dataset: Dataset name
+            pairs: (source_edge, target_edge) tuples
+            algorithm: Routing algorithm ("pruned", "classic", "unidirectional", "bidijkstra")
+            include_geojson: Also build each route's geometry (off by default)
+            max_concurrency: Requests in flight at once on the per-pair fallback
+
+        Returns:
+            One RouteResponse per pair, in the same order as ``pairs``
+        """
+        payload = {
+            "dataset": dataset,
+            "queries": [{"source_edge": s, "target_edge": t} for s, t in pairs],
+            "algorithm": algorithm,
+            "include_geojson": include_geojson
+        }
+        try:
+            resp = self._request("POST", self._url_route_batch, payload, timeout=60)
+            if resp.status_code == 404:
+                if self.is_gateway:
+                    # Unknown dataset, or the gateway's engine has no /route_batch;
+                    # either way the gateway has no /route_by_edge to fall back on
+                    try:
+                        error = _json_loads(resp.content)["detail"]
+                    except Exception:
+                        error = "Batch routing is not supported by the engine behind the gateway"
+                    return [RouteResponse(success=False, error=error) for _ in pairs]
+                return self._route_many_fallback(dataset, pairs, algorithm, include_geojson, max_concurrency)
+            data = _json_loads(resp.content)
+        except Exception as e:
+            return [RouteResponse(success=False, error=str(e)) for _ in pairs]
+
+        if not data.get("success"):
+            error = data.get("error") or str(data.get("detail", "Batch routing failed"))
+            return [RouteResponse(success=False, error=error) for _ in pairs]
+        results = data.get("results") or []
+        if len(results) != len(pairs):
+            error = f"Batch routing returned {len(results)} results for {len(pairs)} queries"
+            return [RouteResponse(success=False, error=error) for _ in pairs]
+        return [self._parse_edge_route(r) for r in results]
+
+    def _route_many_fallback(
+        self,
+        dataset: str,
+        pairs: List[Tuple[int, int]],
+        algorithm: str,
+        include_geojson: bool,
+        max_concurrency: int
+    ) -> List[RouteResponse]:
+        """Route each pair with route_by_edge, overlapping up to max_concurrency requests."""
+        def one(pair):
+            return self._parse_edge_route(
+                self.route_by_edge(dataset, pair[0], pair[1], include_geojson, algorithm)
+            )
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(one, pairs))
+
+    def nearest_edges_many(
+        self,
+        dataset: str,
+        points: List[Tuple[float, float]],
+        k: int = 5,
+        radius_meters: float = 100.0,
+        max_concurrency: int = 16
+    ) -> List[List[Dict]]:
+        """
+        nearest_edges() for many (lat, lon) points, with up to max_concurrency
+        requests in flight on the pooled session.
+
+        Returns:
+            One edge list per point, in the same order as ``points``
+        """
+        def one(point):
+            return self.nearest_edges(dataset, point[0], point[1], k, radius_meters)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(one, points))
+
+    def submit_route(
+        self,
+        dataset: str,
+        source_edge: int,
+        target_edge: int,
+        algorithm: str = "pruned",
+        include_geojson: bool = False
+    ) -> Future:
+        """
+        Queue an edge-to-edge route and return a Future for its RouteResponse.
+
+        Queries submitted close together (within batch_window_ms, up to
+        max_batch) are sent as one /route_batch request by a background
+        thread, so high-rate callers pay one round-trip per batch:
+
+            futures = [client.submit_route(ds, s, t) for s, t in pairs]
+            results = [f.result() for f in futures]
+        """
+        future = Future()
+        with self._batch_lock:
+            if self._batch_thread is None:
+                self._batch_queue = queue.Queue()
+                self._batch_thread = threading.Thread(
+                    target=self._batch_worker, args=(self._batch_queue,), daemon=True
+                )
+                self._batch_thread.start()
+            self._batch_queue.put(((dataset, algorithm, include_geojson), (source_edge, target_edge), future))
+        return future
+
+    def _batch_worker(self, q: queue.Queue):
+        """Drain submit_route() queries into /route_batch requests until the sentinel arrives."""
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            items = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_window_ms / 1000.0
+            while len(items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+
+            # One request per (dataset, algorithm, include_geojson) in the batch
+            groups = {}
+            for key, pair, future in items:
+                groups.setdefault(key, []).append((pair, future))
+            for (dataset, algorithm, include_geojson), entries in groups.items():
+                try:
+                    results = self.route_many(
+                        dataset, [pair for pair, _ in entries], algorithm, include_geojson
+                    )
+                    error = RuntimeError("Batch routing returned fewer results than queries")
+                except Exception as e:
+                    results, error = [], e
+                # Every future gets an outcome, even when results come up short
+                for index, (_, future) in enumerate(entries):
+                    if future.done():  # cancelled by the caller
+                        continue
+                    if index < len(results):
+                        future.set_result(results[index])
+                    else:
+                        future.set_exception(error)
+            if stop:
+                return
+
+    @staticmethod
+    def _parse_edge_route(data: Dict) -> RouteResponse:
+        """Convert one route_by_edge-style result into a RouteResponse."""
+        if not data.get("success"):
+            return RouteResponse(success=False, error=data.get("error"))
+        rget = (data.get("route") or _EMPTY).get
+        return RouteResponse(
+            success=True,
+            distance=rget("distance"),
+            distance_meters=rget("distance_meters", 0.0),
+            runtime_ms=rget("runtime_ms", 0.0),
+            path=rget("path"),
+            geojson=rget("geojson")
+        )
+
+    # ============================================================
+    # ASYNC METHODS - Concurrent queries via httpx
+    # ============================================================
+
+    async def route_async(
+        self,
+        dataset: str,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float,
+        mode: str = "knn",
+        num_candidates: int = 3,
+        algorithm: str = "pruned",
+        include_alternative: bool = False,
+        penalty_factor: float = 2.0,
+        include_geojson: bool = True
+    ) -> RouteResponse:
+        """
+        Async variant of route(). Many calls can be awaited together:
+
+            results = await asyncio.gather(*(client.route_async(ds, *q) for q in queries))
+        """
+        method, url, kwargs = self._route_request(
+            dataset, start_lat, start_lng, end_lat, end_lng,
+            mode, num_candidates, algorithm, include_alternative, penalty_factor,
+            include_geojson
+        )
+        try:
+            resp = await self._arequest(method, url, timeout=10, **kwargs)
+            return self._parse_route(_json_loads(resp.content), include_geojson)
+        except Exception as e:
+            return RouteResponse(success=False, error=str(e))
+
+    async def nearest_edges_async(
+        self,
+        dataset: str,
+        lat: float,
+        lon: float,
+        k: int = 5,
+        radius_meters: float = 100.0,
+        cache: bool = True
+    ) -> List[Dict]:
+        """Async variant of nearest_edges(); shares its result cache."""
+        key = (dataset, round(lat, 6), round(lon, 6), k, radius_meters)
+        if cache:
+            edges = self._nearest_cache_get(key)
+            if edges is not None:
+                return edges
         params = {
             "dataset": dataset,
             "lat": lat,
@@ -346,11 +915,36 @@ class RoutingClient:
             "radius": radius_meters
         }
         try:
-            resp = requests.get(f"{self.base_url}/nearest_edges", params=params, timeout=5)
-            data = resp.json()
-            return data.get("edges", [])
+            resp = await self._arequest("GET", self._url_nearest, params=params, timeout=5)
+            data = _json_loads(resp.content)
         except Exception:
             return []
+        edges = data.get("edges", [])
+        if resp.status_code == 200:
+            self._nearest_cache_put(key, edges)
+        return edges
+
+    async def route_by_edge_async(
+        self,
+        dataset: str,
+        source_edge: int,
+        target_edge: int,
+        include_geojson: bool = True,
+        algorithm: str = "pruned"
+    ) -> Dict:
+        """[DEBUG] Async variant of route_by_edge()."""
+        payload = {
+            "dataset": dataset,
+            "source_edge": source_edge,
+            "target_edge": target_edge,
+            "algorithm": algorithm,
+            "include_geojson": include_geojson
+        }
+        try:
+            resp = await self._arequest("POST", self._url_route_by_edge, payload, timeout=30)
+            return _json_loads(resp.content)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
     # ============================================================
     # DEBUG METHODS - For testing and development
@@ -360,23 +954,30 @@ class RoutingClient:
         self,
         dataset: str,
         source_edge: int,
-        target_edge: int
+        target_edge: int,
+        include_geojson: bool = True,
+        algorithm: str = "pruned"
     ) -> Dict:
         """
         [DEBUG] Route between two edge IDs. Returns expanded path (base edges).
         Skips nearest-edge lookup.
         
+        Args:
+            algorithm: Routing algorithm ("pruned", "classic", "unidirectional", "bidijkstra")
+        
         Returns:
             Dict with 'success', 'path' (expanded edge IDs), 'distance', 'geojson'
         """
         payload = {
             "dataset": dataset,
             "source_edge": source_edge,
-            "target_edge": target_edge
+            "target_edge": target_edge,
+            "algorithm": algorithm,
+            "include_geojson": include_geojson
         }
         try:
-            resp = requests.post(f"{self.base_url}/route_by_edge", json=payload, timeout=30)
-            return resp.json()
+            resp = self._request("POST", self._url_route_by_edge, payload, timeout=30)
+            return _json_loads(resp.content)
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -384,12 +985,16 @@ class RoutingClient:
         self,
         dataset: str,
         source_edge: int,
-        target_edge: int
+        target_edge: int,
+        fields: List[str] = None
     ) -> Dict:
         """
         [DEBUG] Route between two edge IDs. Returns shortcut-level path (not expanded).
         Useful for debugging the CH/shortcut structure.
         
+        Args:
+            fields: Keep only these keys of the returned 'route' (e.g. ["shortcut_path"])
+        
         Returns:
             Dict with 'success', 'shortcut_path' (shortcut IDs before expansion)
         """
@@ -397,25 +1002,38 @@ class RoutingClient:
             "dataset": dataset,
             "source_edge": source_edge,
             "target_edge": target_edge,
-            "expand": False  # Request shortcut-level path
+            "expand": False,  # Request shortcut-level path
+            "include_geojson": False
         }
         try:
-            resp = requests.post(f"{self.base_url}/route_by_edge", json=payload, timeout=30)
-            return resp.json()
+            resp = self._request("POST", self._url_route_by_edge, payload, timeout=30)
+            return self._project_route(_json_loads(resp.content), fields)
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _project_route(data: Dict, fields: List[str] = None) -> Dict:
+        """Trim data['route'] down to the requested fields (all of it if fields is None)."""
+        route = data.get("route")
+        if fields is not None and isinstance(route, dict):
+            data["route"] = {k: route[k] for k in fields if k in route}
+        return data
+
     def route_raw(
         self,
         dataset: str,
         start_lat: float, start_lng: float,
         end_lat: float, end_lng: float,
-        num_candidates: int = 3
+        num_candidates: int = 3,
+        fields: List[str] = None
     ) -> Dict:
         """
         [DEBUG] Route by coordinates. Returns shortcut-level path (not expanded).
         Useful for debugging the CH/shortcut structure.
         
+        Args:
+            fields: Keep only these keys of the returned 'route' (e.g. ["shortcut_path"])
+        
         Returns:
             Dict with 'success', 'shortcut_path' (shortcut IDs before expansion)
         """
@@ -424,10 +1042,11 @@ class RoutingClient:
             "start_lat": start_lat, "start_lng": start_lng,
             "end_lat": end_lat, "end_lng": end_lng,
             "num_candidates": num_candidates,
-            "expand": False  # Request shortcut-level path
+            "expand": False,  # Request shortcut-level path
+            "include_geojson": False
         }
         try:
-            resp = requests.post(f"{self.base_url}/route", json=payload, timeout=30)
-            return resp.json()
+            resp = self._request("POST", self._url_route, payload, timeout=30)
+            return self._project_route(_json_loads(resp.content), fields)
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -6,8 +6,14 @@ setup(
     packages=find_packages(),
     install_requires=[
         "requests>=2.25.0",
+        "urllib3>=1.26",
         "PyYAML>=5.1"
     ],
+    extras_require={
+        "async": ["httpx>=0.23"],
+        "http2": ["httpx[http2]>=0.23"],
+        "fast": ["orjson>=3.6"],
+    },
     author="Routing Platform Team",
     description="Python client for the H3 Routing Platform",
     python_requires=">=3.7",
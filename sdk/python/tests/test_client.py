@@ -0,0 +1,92 @@
+"""
+Unit tests for RoutingClient against a stub HTTP server (no engine needed).
+
+Usage: from sdk/python run:
+  python3 -m pytest -q tests/test_client.py
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from h3_routing_client import RoutingClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Answers /server-status with the next status in server.statuses (200 once
+    they run out), and /route_batch with one result fewer than the queries
+    it received.
+    """
+
+    def do_GET(self):
+        self.server.probes += 1
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self._send(status, {"status": "ok", "datasets_loaded": []} if status == 200 else {"detail": "unavailable"})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        results = [
+            {"success": True, "route": {"distance": 1.0, "path": [q["source_edge"], q["target_edge"]]}}
+            for q in body["queries"]
+        ]
+        self._send(200, {"success": True, "results": results[:-1]})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.statuses = []
+    server.probes = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_url(stub_server):
+    return stub_server.url
+
+
+def test_unavailable_probe_is_not_cached_process_wide(stub_server):
+    stub_server.statuses = [503]
+    with RoutingClient(stub_server.url) as first:
+        assert first.is_gateway is False
+        # Remembered for this client: no second probe
+        assert first.is_gateway is False
+    assert stub_server.probes == 1
+    with RoutingClient(stub_server.url) as second:
+        assert second.is_gateway is True
+    assert stub_server.probes == 2
+
+
+def test_route_many_short_batch_fails_every_pair(stub_url):
+    with RoutingClient(stub_url) as client:
+        pairs = [(1, 2), (3, 4), (5, 6)]
+        results = client.route_many("somerset", pairs)
+    assert len(results) == len(pairs)
+    assert not any(r.success for r in results)
+    assert "2 results for 3 queries" in results[0].error
+
+
+def test_submit_route_resolves_every_future_on_short_batch(stub_url):
+    with RoutingClient(stub_url) as client:
+        client.batch_window_ms = 50
+        futures = [client.submit_route("somerset", s, s + 1) for s in range(3)]
+        results = [f.result(timeout=2) for f in futures]
+    assert len(results) == 3
+    assert not any(r.success for r in results)
@@ -1,12 +1,35 @@
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 from dataclasses import dataclass
 from typing import List, Optional
 import logging
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used if orjson isn't installed
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def make_session(pool_maxsize: int = 64) -> requests.Session:
+    """Create a keep-alive session with a connection pool sized for concurrent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _json(response: requests.Response):
+    """Decode a response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 @dataclass
 class QueryResult:
     """Result from a shortest path query."""
@@ -29,7 +52,8 @@ class CHQueryEngine:
         self,
         dataset_name: str,
         server_url: str = "http://localhost:8082",
-        timeout: int = 30
+        timeout: int = 30,
+        session: Optional[requests.Session] = None
     ):
         """
         Initialize the query engine client.
@@ -38,10 +62,15 @@ class CHQueryEngine:
             dataset_name: Name of the dataset to query (e.g. "Burnaby")
             server_url: Base URL of the routing server
             timeout: Request timeout in seconds
+            session: Keep-alive session to share (a private one is created if omitted)
         """
         self.dataset_name = dataset_name.lower()
         self.server_url = server_url.rstrip('/')
+        self._url_route = self.server_url + "/route"
+        self._url_nearest_edges = self.server_url + "/nearest_edges"
+        self._url_nearest_edge = self.server_url + "/nearest_edge"
         self.timeout = timeout
+        self._session = session if session is not None else make_session()
         
         # REMOVED: Do not auto-load. Let user control it via /load_dataset endpoint.
         # self._ensure_dataset_loaded()
@@ -50,7 +79,7 @@ class CHQueryEngine:
         try:
             payload = {"dataset": self.dataset_name}
             # Just try to load - idempotent
-            requests.post(
+            self._session.post(
                 f"{self.server_url}/load_dataset",
                 json=payload,
                 timeout=self.timeout
@@ -129,23 +158,23 @@ class CHQueryEngine:
                 "num_candidates": target_candidates,
                 "search_radius": search_radius,
                 "include_alternative": kwargs.get("include_alternative", False),
-                "penalty_factor": kwargs.get("penalty_factor", 2.0)
+                "penalty_factor": kwargs.get("penalty_factor", 2.0),
+                "include_geojson": kwargs.get("include_geojson", True)
             }
             
-            t0 = time.time()
-            response = requests.post(
-                f"{self.server_url}/route",
+            t0 = time.perf_counter()
+            response = self._session.post(
+                self._url_route,
                 json=payload,
                 timeout=self.timeout
             )
-            t1 = time.time()
-            client_side_ms = (t1 - t0) * 1000.0
+            client_side_ms = (time.perf_counter() - t0) * 1000.0
 
             if response.status_code != 200:
                 logger.error(f"Routing server returned {response.status_code}")
                 return QueryResult(success=False, error=f"Server returned {response.status_code}")
 
-            data = response.json()
+            data = _json(response)
             
             # Check for explicit errors from server
             if not data.get("success", False):
@@ -198,12 +227,12 @@ class CHQueryEngine:
                 "radius": radius,
                 "max_candidates": max_candidates
             }
-            response = requests.post(
-                f"{self.server_url}/nearest_edges",
+            response = self._session.post(
+                self._url_nearest_edges,
                 json=payload,
                 timeout=self.timeout
             )
-            return response.json()
+            return _json(response)
         except Exception as e:
             logger.error(f"Nearest edges request failed: {e}")
             return {"success": False, "error": str(e)}
@@ -225,12 +254,12 @@ class CHQueryEngine:
                 "lat": lat,
                 "lon": lon
             }
-            response = requests.post(
-                f"{self.server_url}/nearest_edge",
+            response = self._session.post(
+                self._url_nearest_edge,
                 json=payload,
                 timeout=self.timeout
             )
-            return response.json()
+            return _json(response)
         except Exception as e:
             logger.error(f"Nearest edge request failed: {e}")
             return {"success": False, "error": str(e)}
@@ -245,6 +274,10 @@ class CHQueryEngineFactory:
         self.server_url = server_url
         self._configs = {}
         self._engines = {}  # Cache for instantiated engines
+        # One connection pool shared by every engine (they all hit the same server)
+        self._session = make_session()
+        # Guards _configs/_engines against concurrent request handlers
+        self._lock = threading.Lock()
     
     def register_dataset(self, name: str, **kwargs):
         """
@@ -254,19 +287,25 @@ class CHQueryEngineFactory:
            name: Dataset name (e.g. "Burnaby")
            **kwargs: Ignored for HTTP client (paths are handled by server)
         """
-        self._configs[name] = kwargs
-        # Invalidate cache if re-registering? 
-        # For now, simplistic overwrite.
-        if name in self._engines:
-            del self._engines[name]
+        with self._lock:
+            self._configs[name] = kwargs
+            # Invalidate cache if re-registering? 
+            # For now, simplistic overwrite.
+            self._engines.pop(name, None)
     
     def get_engine(self, name: str) -> CHQueryEngine:
-        # Check cache first
-        if name not in self._engines:
-            self._engines[name] = CHQueryEngine(name, self.server_url)
-        return self._engines[name]
+        """Engine client for a dataset, created on first use (registration is optional)."""
+        # Lock-free fast path for the common already-built case
+        engine = self._engines.get(name)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(name)
+                if engine is None:
+                    engine = CHQueryEngine(name, self.server_url, session=self._session)
+                    self._engines[name] = engine
+        return engine
     
-    def check_health(self) -> dict:
+    def check_health(self, timeout: float = 5) -> dict:
         """
         Check if the routing server is healthy and get loaded datasets.
         
@@ -274,10 +313,15 @@ class CHQueryEngineFactory:
             Dict with keys: status, datasets_loaded
         """
         try:
-            response = requests.get(f"{self.server_url}/health", timeout=5)
-            return response.json()
+            response = self._session.get(f"{self.server_url}/health", timeout=timeout)
+            return _json(response)
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
 
     def list_datasets(self) -> List[str]:
-        return list(self._configs.keys())
+        with self._lock:
+            return list(self._configs.keys())
+
+    def close(self):
+        """Close the shared session and its pooled connections."""
+        self._session.close()
@@ -2,7 +2,7 @@
 Data loader module for edge geometries and spatial indexing.
 
 This module handles:
-- Loading edge CSV files with WKT LineString geometries
+- Loading edge CSV (or Parquet) files with WKT LineString geometries
 - Building R-tree spatial indices for nearest-neighbor queries
 - Finding nearest edges to lat/lon coordinates
 """
@@ -21,6 +21,9 @@ from shapely.geometry import LineString, Point
 
 logger = logging.getLogger(__name__)
 
+# Edge CSV columns used by SpatialIndex (everything else is skipped on read)
+EDGE_COLUMNS = ('id', 'edge_index', 'geometry', 'length', 'highway')
+
 
 @dataclass
 class EdgeData:
@@ -39,21 +42,38 @@ class SpatialIndex:
         Initialize spatial index from edge CSV.
         
         Args:
-            edges_csv_path: Path to CSV file with columns: id, geometry, length, highway
+            edges_csv_path: Path to CSV file with columns: id, geometry, length, highway.
+                A Parquet file with the same stem is preferred when it exists.
         """
         self.edges_csv_path = Path(edges_csv_path)
         self.edges: Dict[int, EdgeData] = {}
         self.idx = index.Index()
         self._load_edges()
     
-    def _load_edges(self):
-        """Load edges from CSV and build spatial index."""
-        logger.info(f"Loading edges from {self.edges_csv_path}")
+    def _read_edges_frame(self) -> pd.DataFrame:
+        """
+        Read the edge table, preferring Parquet over CSV.
+        
+        A `.parquet` path is read directly; for a `.csv` path a Parquet file
+        with the same stem is used when present. Only EDGE_COLUMNS are read.
+        """
+        parquet_path = self.edges_csv_path.with_suffix('.parquet')
+        if parquet_path.exists():
+            import pyarrow.parquet as pq
+            
+            logger.info(f"Loading edges from {parquet_path}")
+            available = pq.read_schema(parquet_path).names
+            columns = [c for c in EDGE_COLUMNS if c in available]
+            return pq.read_table(parquet_path, columns=columns, memory_map=True).to_pandas()
         
+        logger.info(f"Loading edges from {self.edges_csv_path}")
         if not self.edges_csv_path.exists():
             raise FileNotFoundError(f"Edge CSV not found: {self.edges_csv_path}")
-        
-        df = pd.read_csv(self.edges_csv_path)
+        return pd.read_csv(self.edges_csv_path, usecols=lambda c: c in EDGE_COLUMNS)
+    
+    def _load_edges(self):
+        """Load edges from CSV/Parquet and build spatial index."""
+        df = self._read_edges_frame()
         if 'id' not in df.columns and 'edge_index' in df.columns:
             df = df.rename(columns={'edge_index': 'id'})
             
@@ -64,18 +84,18 @@ class SpatialIndex:
         
         logger.info(f"Parsing {len(df)} edges...")
         
-        for idx_row, row in df.iterrows():
+        for row in df.itertuples():
             try:
-                edge_id = int(row['id'])
-                geom = wkt.loads(row['geometry'])
+                edge_id = int(row.id)
+                geom = wkt.loads(row.geometry)
                 
                 if not isinstance(geom, LineString):
                     logger.warning(f"Edge {edge_id} has non-LineString geometry: {type(geom)}")
                     continue
                 
                 # Extract optional metadata
-                length = float(row.get('length', 0.0))
-                highway = str(row.get('highway', 'unknown'))
+                length = float(getattr(row, 'length', 0.0))
+                highway = str(getattr(row, 'highway', 'unknown'))
                 
                 # Store edge data
                 edge_data = EdgeData(
@@ -91,7 +111,7 @@ class SpatialIndex:
                 self.idx.insert(edge_id, bounds)
                 
             except Exception as e:
-                logger.warning(f"Failed to parse edge at row {idx_row}: {e}")
+                logger.warning(f"Failed to parse edge at row {row.Index}: {e}")
                 continue
         
         logger.info(f"Loaded {len(self.edges)} edges into spatial index")
@@ -338,6 +358,10 @@ class DatasetRegistry:
             
         return info
 
+    def has_dataset(self, name: str) -> bool:
+        """Check whether a dataset is registered (dict lookup, no list copy)."""
+        return name in self.datasets
+
     def list_datasets(self) -> list:
         """List all registered datasets."""
         return list(self.datasets.keys())
@@ -7,22 +7,48 @@ This server provides REST API endpoints for:
 - Computing shortest paths and returning GeoJSON routes
 """
 
+import asyncio
+import gzip
+import hashlib
 import json
 import logging
+import os
+import re
+import socket
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
-import requests
+import httpx
 
+import numpy as np
+import shapely
 import yaml
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, confloat, model_validator
+from shapely.geometry import mapping, shape
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    orjson = None
+    from fastapi.responses import JSONResponse as DefaultResponse
 
 from api.data_loader import DatasetRegistry
 from api.ch_query import CHQueryEngineFactory
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,11 +56,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load configuration on startup; release pooled connections on shutdown."""
+    logger.info("Starting Contraction Hierarchies API server...")
+    load_config()
+    # One keep-alive pool for every proxied call to the C++ server
+    app.state.http = httpx.AsyncClient(
+        base_url=ch_factory.server_url,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
+    logger.info("Server startup complete")
+    yield
+    await app.state.http.aclose()
+    ch_factory.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Contraction Hierarchies Routing API",
     description="REST API for querying shortest paths on road networks using Contraction Hierarchies",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Route responses carry large GeoJSON; orjson encodes them much faster when installed
+    default_response_class=DefaultResponse
 )
 
 # Enable CORS for Streamlit frontend
@@ -46,12 +92,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class TilesAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes .pmtiles archives through untouched."""
+
+    async def __call__(self, scope, receive, send):
+        # The tiles inside an archive are already compressed, and PMTiles
+        # clients need the raw bytes of the ranges they ask for
+        if scope["type"] == "http" and scope["path"].endswith(BOUNDARY_TILES_SUFFIX):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress large responses (route geojson is mostly coordinate text)
+app.add_middleware(TilesAwareGZipMiddleware, minimum_size=1024)
+
 # Global dataset registry
 registry = DatasetRegistry()
 
 # Global CH query engine factory
 ch_factory = CHQueryEngineFactory()
 
+# (ETag, JSON body) of the /datasets response; cleared by load/unload
+_datasets_cache: Optional[Tuple[str, bytes]] = None
+
+# datasets.yaml passed to load_config(), read again by /bootstrap
+_config_file: Optional[Path] = None
+# (yaml mtime_ns, ETag, JSON body, {dataset: gzipped boundary JSON body},
+# {dataset: boundary .pmtiles path}) behind /bootstrap and the
+# /datasets/{name}/boundary* endpoints; cleared by load/unload
+_bootstrap_cache: Optional[Tuple[int, str, bytes, Dict[str, bytes], Dict[str, str]]] = None
+
+# LRU of successful lat/lon route response bodies (JSON bytes); cleared by
+# load/unload. Only touched from the event loop, so no lock is needed.
+ROUTE_CACHE_SIZE = 4096
+_route_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+# Bumped with every clear, so an engine call that started before a load/unload
+# neither caches its result nor is shared with requests made after it
+_route_generation = 0
+
+
+def _route_cache_key(dataset, src_lat, src_lon, tgt_lat, tgt_lon, search_mode,
+                     algorithm, num_candidates, search_radius, include_alternative,
+                     penalty_factor, include_geojson) -> tuple:
+    """Quantize coordinates to ~1 m so repeat clicks on the same spot hit."""
+    return (dataset, round(src_lat, 5), round(src_lon, 5), round(tgt_lat, 5), round(tgt_lon, 5),
+            search_mode, algorithm, num_candidates, round(search_radius),
+            include_alternative, penalty_factor, include_geojson)
+
+
+def _route_cache_get(key: tuple) -> Optional[bytes]:
+    response = _route_cache.get(key)
+    if response is not None:
+        _route_cache.move_to_end(key)
+    return response
+
+
+def _route_cache_put(key: tuple, response: bytes) -> None:
+    _route_cache[key] = response
+    _route_cache.move_to_end(key)
+    if len(_route_cache) > ROUTE_CACHE_SIZE:
+        _route_cache.popitem(last=False)
+
+
+def invalidate_route_cache() -> None:
+    """Drop cached routes and start a new generation (datasets changed)."""
+    global _route_generation
+    _route_generation += 1
+    _route_cache.clear()
+
+
+# Route queries currently awaiting the engine, by (generation, route cache key);
+# identical concurrent requests await the same future instead of querying again
+_route_inflight: Dict[tuple, asyncio.Future] = {}
+
+
+async def route_body(cache_key: tuple, ch_engine, dataset: str, include_geojson: bool,
+                     **query) -> Union[bytes, "RouteResponse"]:
+    """
+    Success body (JSON bytes) or failure RouteResponse for a lat/lon route.
+
+    Callers check the route cache first; on a miss, concurrent callers with
+    the same key share a single engine call.
+    """
+    inflight_key = (_route_generation, cache_key)
+    if inflight_key not in _route_inflight:
+        _route_inflight[inflight_key] = asyncio.ensure_future(
+            _fetch_route_body(inflight_key, ch_engine, dataset, include_geojson, query)
+        )
+    # shield: a disconnecting client must not cancel the others' query
+    return await asyncio.shield(_route_inflight[inflight_key])
+
+
+async def _fetch_route_body(inflight_key: tuple, ch_engine, dataset: str, include_geojson: bool,
+                            query: Dict) -> Union[bytes, "RouteResponse"]:
+    generation, cache_key = inflight_key
+    try:
+        # The engine client is blocking, so run it off the event loop
+        result = await asyncio.to_thread(
+            ch_engine.compute_route_latlon, include_geojson=include_geojson, **query
+        )
+        if not result.success:
+            return RouteResponse(success=False, error=result.error or "Routing failed")
+        body = route_success_body(dataset, result, include_geojson)
+        # A load/unload while the engine was busy makes this result stale
+        if generation == _route_generation:
+            _route_cache_put(cache_key, body)
+        return body
+    finally:
+        del _route_inflight[inflight_key]
+
+
+# (monotonic time, payload) of the last /server-status answer and the fetch
+# currently in flight, if any; the cache is cleared by load/unload
+SERVER_STATUS_TTL = 0.5
+_status_cache: Optional[Tuple[float, Dict]] = None
+_status_inflight: Optional[asyncio.Future] = None
+
 
 class DatasetInfo(BaseModel):
     """Dataset metadata."""
@@ -91,19 +249,90 @@ class RouteResponse(BaseModel):
     alternative_route: Optional[Dict] = None
 
 
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
 
-def load_config(config_path: str = "config/datasets.yaml"):
-    """Load dataset configuration from YAML file and initialize C++ server."""
-    config_file = Path(config_path)
-    
-    if not config_file.exists():
-        logger.warning(f"Config file not found: {config_path}")
-        return
-    
-    logger.info(f"Loading configuration from {config_path}")
-    
+
+def _read_json(path: str):
+    """Parse a JSON file from one bytes read (no incremental text decoding)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def route_success_body(dataset: str, result, include_geojson: bool) -> bytes:
+    """
+    Serialize a successful engine result in the RouteResponse shape.
+
+    Built by hand rather than through RouteResponse so the (possibly
+    10k-coordinate) GeoJSON is not walked by pydantic on every response.
+    """
+    feature = result.geojson
+    # Fallback if server didn't return geojson (should not happen with new server)
+    if not feature and include_geojson:
+        feature = {
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": []},
+            "properties": {"distance": result.distance, "warning": "No geometry returned"}
+        }
+    return _dumps({
+        "success": True,
+        "dataset": dataset,
+        "distance": result.distance,
+        "distance_meters": result.distance_meters,
+        "runtime_ms": result.runtime_ms,
+        "path": result.path,
+        "geojson": feature,
+        "timing_breakdown": result.timing_breakdown,
+        "debug": result.debug,
+        "error": None,
+        "alternative_route": result.alternative_route,
+    })
+
+
+def json_bytes_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def etag_response(body: bytes, request: Request, headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON response with an ETag of its body, or a 304 if the client already has that body."""
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return json_bytes_response(body, headers)
+
+
+# GET /route successes are deterministic for their URL, so browsers may reuse
+# them briefly (e.g. when the alternative-route toggle is switched back) and
+# then revalidate them against the ETag
+ROUTE_CACHE_CONTROL = {"Cache-Control": "public, max-age=5"}
+
+
+
+# Resolved datasets.yaml is cached next to it in this JSON sidecar
+RESOLVED_CONFIG_SUFFIX = ".resolved.json"
+# "{name}" placeholders in config paths ({project_root}, {data_root}, ...)
+_TEMPLATE_FIELD = re.compile(r"\{(\w+)\}")
+
+
+def fill_template(template: str, context: Dict[str, str]) -> str:
+    """Substitute {name} placeholders from context (KeyError on unknown names, like str.format)."""
+    if "{" not in template:
+        return template
+    return _TEMPLATE_FIELD.sub(lambda m: context[m.group(1)], template)
+
+
+# Per-dataset path settings in datasets.yaml, in registry keyword order
+PATH_FIELDS = ("db_path", "shortcuts_path", "edges_path", "binary_path", "boundary_path")
+
+
+def resolve_datasets(config_file: Path) -> List[Dict]:
+    """Parse datasets.yaml and resolve the path templates of every dataset."""
     with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
     
     datasets = config.get('datasets', [])
     paths_config = config.get('paths', {})
@@ -119,106 +348,159 @@ def load_config(config_path: str = "config/datasets.yaml"):
     if paths_config:
         for key, value in paths_config.items():
             if isinstance(value, str):
-                resolved_paths[key] = value.format(**resolution_context)
+                resolved_paths[key] = fill_template(value, resolution_context)
         # Update context with resolved paths
         resolution_context.update(resolved_paths)
 
-    # Wait for C++ server health
-    server_url = "http://localhost:8082"
-    max_retries = 60
+    # Relative paths fall back to being relative to the config dir's parent.
+    # Plain string checks: this runs for every path of every dataset.
+    base_dir = str(config_file.parent.parent)
+    isabs, join = os.path.isabs, os.path.join
+
+    resolved = []
+    for ds in datasets:
+        # Support both DuckDB (preferred) and legacy file paths
+        entry = {"name": ds['name']}
+        for key in PATH_FIELDS:
+            value = ds.get(key, '')
+            # Resolve variables using the full context (project_root + paths)
+            if value:
+                value = fill_template(value, resolution_context)
+                if key != "boundary_path" and not isabs(value):
+                    value = join(base_dir, value)
+            entry[key] = value
+        resolved.append(entry)
+    return resolved
+
+
+def load_resolved_datasets(config_file: Path) -> List[Dict]:
+    """
+    resolve_datasets() behind a JSON sidecar (datasets.resolved.json).
+
+    The sidecar is reused while the YAML's mtime, the project root and the
+    working directory (relative paths resolve against it) are unchanged, so
+    warm restarts skip YAML parsing and templating.
+    """
+    cache_file = config_file.with_suffix(RESOLVED_CONFIG_SUFFIX)
+    key = {
+        "source_mtime_ns": config_file.stat().st_mtime_ns,
+        "project_root": str(Path(__file__).resolve().parents[3]),
+        "cwd": os.getcwd()
+    }
+    try:
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            return cached["datasets"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    datasets = resolve_datasets(config_file)
+    try:
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({"key": key, "datasets": datasets}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write resolved config cache {cache_file}: {e}")
+    return datasets
+
+
+def server_listening(server_url: str, timeout: float = 0.05) -> bool:
+    """True if something accepts TCP connections at server_url's host:port."""
+    parts = urlsplit(server_url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        with socket.create_connection((parts.hostname or "localhost", port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def load_config(config_path: str = "config/datasets.yaml"):
+    """Load dataset configuration from YAML file and initialize C++ server."""
+    config_file = Path(config_path)
+    
+    if not config_file.exists():
+        logger.warning(f"Config file not found: {config_path}")
+        return
+    
+    global _config_file
+    _config_file = config_file
+    logger.info(f"Loading configuration from {config_path}")
+    datasets = load_resolved_datasets(config_file)
+
+    # Wait for the C++ server to become healthy, with exponential backoff
+    # (10ms .. 1s), for at most 60s. A bare TCP connect is tried first; /health
+    # is asked only once the port is open, and retried until it reports healthy.
+    deadline = time.monotonic() + 60
+    delay = 0.01
     server_ready = False
     
-    for i in range(max_retries):
-        try:
-            requests.get(f"{server_url}/health", timeout=1)
-            server_ready = True
+    while True:
+        if server_listening(ch_factory.server_url):
+            server_ready = ch_factory.check_health().get("status") != "unhealthy"
+            if server_ready:
+                break
+        if time.monotonic() >= deadline:
             break
-        except requests.RequestException:
-            logger.info(f"Waiting for C++ server... ({i+1}/{max_retries})")
-            time.sleep(1)
+        if delay >= 1.0:
+            logger.info("Waiting for C++ server...")
+        time.sleep(delay)
+        delay = min(1.0, delay * 2)
             
     if not server_ready:
         logger.error("C++ server is not reachable. Skipping dataset loading.")
     
+    # Register datasets (prefer db_path). Only metadata is recorded here:
+    # ch_factory.get_engine() builds a dataset's engine client on its first query.
     for ds in datasets:
-        name = ds['name']
-        
-        # Support both DuckDB (preferred) and legacy file paths
-        db_path = ds.get('db_path', '')
-        shortcuts_path = ds.get('shortcuts_path', '')
-        edges_path = ds.get('edges_path', '')
-        binary_path = ds.get('binary_path', '')
-        boundary_path = ds.get('boundary_path', '')
-
-        # Resolve variables using the full context (project_root + paths)
-        if resolution_context:
-            if db_path:
-                db_path = db_path.format(**resolution_context)
-            if shortcuts_path:
-                shortcuts_path = shortcuts_path.format(**resolution_context)
-            if edges_path:
-                edges_path = edges_path.format(**resolution_context)
-            if binary_path:
-                binary_path = binary_path.format(**resolution_context)
-            if boundary_path:
-                boundary_path = boundary_path.format(**resolution_context)
-            # Store resolved boundary path back in dataset info
-            ds['boundary_path'] = boundary_path
-        
-        # Resolve relative paths (fallback to config dir relative)
-        base_dir = config_file.parent.parent
-        if db_path and not Path(db_path).is_absolute():
-            db_path = str(base_dir / db_path)
-        if shortcuts_path and not Path(shortcuts_path).is_absolute():
-            shortcuts_path = str(base_dir / shortcuts_path)
-        if edges_path and not Path(edges_path).is_absolute():
-            edges_path = str(base_dir / edges_path)
-        if binary_path and not Path(binary_path).is_absolute():
-            binary_path = str(base_dir / binary_path)
-        
-        # Register dataset (prefer db_path)
-        registry.register_dataset(name, db_path=db_path, shortcuts_path=shortcuts_path, edges_path=edges_path, binary_path=binary_path, boundary_path=boundary_path)
-        logger.info(f"Registered dataset '{name}' (db_path={db_path if db_path else 'N/A'})")
-        
-        # Also register with CH query engine factory (legacy support)
-        if shortcuts_path and edges_path:
-            try:
-                ch_factory.register_dataset(
-                    name=name,
-                    shortcuts_path=shortcuts_path,
-                    edges_path=edges_path,
-                    binary_path=binary_path,
-                    timeout=30
-                )
-            except Exception as e:
-                logger.warning(f"CH engine not available for {name}: {e}")
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Load configuration on startup."""
-    logger.info("Starting Contraction Hierarchies API server...")
-    load_config()
-    logger.info("Server startup complete")
+        registry.register_dataset(**ds)
+        logger.info(f"Registered dataset '{ds['name']}' (db_path={ds['db_path'] or 'N/A'})")
+
+
+_ROOT_BODY = _dumps({
+    "name": "Contraction Hierarchies Routing API",
+    "version": "1.0.0",
+    "endpoints": {
+        "/datasets": "List available datasets",
+        "/bootstrap": "Dataset map for the web UI (config, metadata, boundaries)",
+        "/nearest-edge": "Find nearest edge to coordinates",
+        "/route": "Compute shortest path between two points"
+    }
+})
 
 
 @app.get("/")
 async def root():
     """API root endpoint."""
-    return {
-        "name": "Contraction Hierarchies Routing API",
-        "version": "1.0.0",
-        "endpoints": {
-            "/datasets": "List available datasets",
-            "/nearest-edge": "Find nearest edge to coordinates",
-            "/route": "Compute shortest path between two points"
-        }
-    }
+    return json_bytes_response(_ROOT_BODY)
 
 
 @app.get("/datasets", response_model=List[DatasetInfo])
-async def list_datasets():
-    """List all available datasets with enriched metadata."""
+async def list_datasets(request: Request):
+    """
+    List all available datasets with enriched metadata.
+
+    The serialized list is built once and served with an ETag until a
+    dataset is loaded or unloaded; clients sending If-None-Match get a 304.
+    """
+    global _datasets_cache
+    if _datasets_cache is None:
+        # Enrichment opens each DuckDB file, so keep it off the event loop
+        result = await asyncio.to_thread(build_dataset_list)
+        body = _dumps([info.model_dump() for info in result])
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        _datasets_cache = (etag, body)
+
+    etag, body = _datasets_cache
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def build_dataset_list() -> List[DatasetInfo]:
+    """DatasetInfo for every registered dataset."""
     dataset_names = registry.list_datasets()
     
     result = []
@@ -243,6 +525,279 @@ async def list_datasets():
     return result
 
 
+@app.get("/bootstrap")
+async def bootstrap(request: Request):
+    """
+    Everything the web UI needs to draw its dataset picker, in one document.
+
+    Boundaries are left out (the UI fetches the selected dataset's from
+    /datasets/{name}/boundary, or draws it from boundary.pmtiles); each
+    entry says whether it has_boundary and has boundary_tiles.
+    Cached with an ETag until datasets.yaml changes or a dataset is loaded
+    or unloaded.
+    """
+    etag, body, _, _ = await _ui_bootstrap()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/datasets/{name}/boundary")
+async def dataset_boundary(name: str, request: Request):
+    """
+    Simplified boundary GeoJSON of a dataset, as listed by /bootstrap.
+
+    Boundaries are kept gzipped and sent as-is with Content-Encoding: gzip
+    (GZipMiddleware leaves encoded responses alone); they are only
+    decompressed for the rare client that does not accept gzip.
+    """
+    _, _, boundaries, _ = await _ui_bootstrap()
+    body = boundaries.get(name)
+    if body is None:
+        raise HTTPException(status_code=404, detail=f"No boundary for dataset: {name}")
+    if "gzip" not in request.headers.get("accept-encoding", ""):
+        return json_bytes_response(gzip.decompress(body))
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+    )
+
+
+@app.get("/datasets/{name}/boundary.pmtiles")
+async def dataset_boundary_tiles(name: str, request: Request):
+    """
+    Pre-built vector tiles of a dataset's boundary (scripts/prepare_data.sh
+    writes them with tippecanoe when it is installed).
+
+    PMTiles clients read the archive with HTTP Range requests, so a single
+    byte range is answered with 206; anything else streams the whole file.
+    The route is excluded from gzip (see TilesAwareGZipMiddleware).
+    """
+    _, _, _, tiles = await _ui_bootstrap()
+    path = tiles.get(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No boundary tiles for dataset: {name}")
+    ranged = await asyncio.to_thread(read_byte_range, path, request.headers.get("range"))
+    if ranged is None:
+        return FileResponse(path, media_type="application/octet-stream", headers={"Accept-Ranges": "bytes"})
+    status, headers, body = ranged
+    headers["Accept-Ranges"] = "bytes"
+    return Response(content=body, status_code=status, media_type="application/octet-stream", headers=headers)
+
+
+_BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def read_byte_range(path: str, range_header: Optional[str]) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+    """(status, headers, body) for a single byte range of path, or None if range_header is not one."""
+    match = _BYTE_RANGE.match(range_header.strip()) if range_header else None
+    if match and any(match.groups()):
+        size = os.path.getsize(path)
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last) if last else size - 1, size - 1)
+        else:  # suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+        if start > end:
+            return 416, {"Content-Range": f"bytes */{size}"}, b""
+        with open(path, 'rb') as f:
+            f.seek(start)
+            body = f.read(end - start + 1)
+        return 206, {"Content-Range": f"bytes {start}-{end}/{size}"}, body
+    return None
+
+
+async def _ui_bootstrap() -> Tuple[str, bytes, Dict[str, bytes], Dict[str, str]]:
+    """(ETag, /bootstrap body, boundary bodies, boundary tile paths), rebuilt when datasets.yaml changes."""
+    global _bootstrap_cache
+    if _config_file is None:
+        raise HTTPException(status_code=404, detail="No dataset configuration loaded")
+    mtime_ns = _config_file.stat().st_mtime_ns
+    if _bootstrap_cache is None or _bootstrap_cache[0] != mtime_ns:
+        dataset_map = await build_ui_dataset_map(_config_file)
+        boundaries = {}
+        tiles = {}
+        for name, entry in dataset_map.items():
+            boundary = entry.pop('boundary')
+            entry['has_boundary'] = boundary is not None
+            if boundary is not None:
+                boundaries[name] = gzip.compress(_dumps(boundary), compresslevel=9)
+            tiles_path = entry.pop('boundary_tiles')
+            entry['boundary_tiles'] = tiles_path is not None
+            if tiles_path is not None:
+                tiles[name] = tiles_path
+        body = _dumps(dataset_map)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        _bootstrap_cache = (mtime_ns, etag, body, boundaries, tiles)
+    return _bootstrap_cache[1:]
+
+
+# Boundaries are only drawn as outlines, so they are simplified and rounded
+# to 5 decimals (~1 m) before being shipped to the UI. The tolerance follows
+# the boundary's size: 1/10000 of its larger span, but at least ~10 m (so a
+# city keeps 1e-4 degrees while a country-sized outline gets ~1e-3)
+BOUNDARY_TOLERANCE = 1e-4
+BOUNDARY_SPAN_FRACTION = 1e-4
+BOUNDARY_DECIMALS = 5
+# Simplified boundary files are cached next to the source in this JSON sidecar
+SIMPLIFIED_BOUNDARY_SUFFIX = ".simplified.json"
+# Vector tiles of a boundary file, when built, sit next to it with this suffix
+BOUNDARY_TILES_SUFFIX = ".pmtiles"
+
+
+def boundary_tiles_path(boundary_path: Optional[str]) -> Optional[str]:
+    """The boundary file's .pmtiles archive, or None if it was not built."""
+    if not boundary_path:
+        return None
+    tiles_path = os.path.splitext(boundary_path)[0] + BOUNDARY_TILES_SUFFIX
+    return tiles_path if os.path.isfile(tiles_path) else None
+
+
+def _geometries(obj: Dict):
+    """GeoJSON geometries inside a geometry, Feature or FeatureCollection."""
+    kind = obj.get("type")
+    if kind == "FeatureCollection":
+        for f in obj.get("features", []):
+            yield from _geometries(f)
+    elif kind == "Feature":
+        if obj.get("geometry"):
+            yield obj["geometry"]
+    else:
+        yield obj
+
+
+def boundary_tolerance(obj: Dict) -> float:
+    """Simplification tolerance (degrees) for a boundary of this extent."""
+    bounds = [shape(g).bounds for g in _geometries(obj)]
+    if not bounds:
+        return BOUNDARY_TOLERANCE
+    min_x, min_y, max_x, max_y = np.array(bounds).T
+    span = max(max_x.max() - min_x.min(), max_y.max() - min_y.min())
+    return max(BOUNDARY_TOLERANCE, float(span) * BOUNDARY_SPAN_FRACTION)
+
+
+def simplify_geojson(obj: Dict, tolerance: Optional[float] = None) -> Dict:
+    """
+    Simplified copy of a GeoJSON geometry, Feature or FeatureCollection.
+
+    One tolerance, derived from the extent of the whole object unless given,
+    is used for every feature so shared borders simplify the same way.
+    """
+    if tolerance is None:
+        tolerance = boundary_tolerance(obj)
+    kind = obj.get("type")
+    if kind == "FeatureCollection":
+        return {**obj, "features": [simplify_geojson(f, tolerance) for f in obj.get("features", [])]}
+    if kind == "Feature":
+        if not obj.get("geometry"):
+            return obj
+        return {**obj, "geometry": simplify_geojson(obj["geometry"], tolerance)}
+    geom = shape(obj).simplify(tolerance, preserve_topology=True)
+    geom = shapely.transform(geom, lambda coords: np.round(coords, BOUNDARY_DECIMALS))
+    return mapping(geom)
+
+
+def load_boundary(boundary_path: str) -> Optional[Dict]:
+    """
+    Simplified GeoJSON of a boundary file, or None if it does not exist.
+
+    The simplified copy is kept in a sidecar keyed on the source's mtime and
+    the simplification settings, so it is rebuilt only when either changes.
+    """
+    try:
+        mtime_ns = os.stat(boundary_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    settings = [BOUNDARY_TOLERANCE, BOUNDARY_SPAN_FRACTION, BOUNDARY_DECIMALS]
+    cache_file = os.path.splitext(boundary_path)[0] + SIMPLIFIED_BOUNDARY_SUFFIX
+    try:
+        cached = _read_json(cache_file)
+        if cached.get("source_mtime_ns") == mtime_ns and cached.get("settings") == settings:
+            return cached["boundary"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    boundary = simplify_geojson(_read_json(boundary_path))
+    try:
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps({"source_mtime_ns": mtime_ns, "settings": settings, "boundary": boundary}))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write simplified boundary {cache_file}: {e}")
+    return boundary
+
+
+def read_yaml(config_file: Path) -> Dict:
+    with open(config_file, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+async def build_ui_dataset_map(config_file: Path) -> Dict[str, Dict]:
+    """
+    Web UI entry for every dataset in datasets.yaml, keyed by dataset name.
+
+    Display settings from the config win over the enriched metadata; the
+    boundary comes from the database, else from the dataset's boundary_path,
+    and is simplified either way. The config, the enrichment (which opens
+    each DuckDB file) and the per-dataset boundaries are read concurrently
+    in worker threads.
+    """
+    config, dataset_list, resolved = await asyncio.gather(
+        asyncio.to_thread(read_yaml, config_file),
+        asyncio.to_thread(build_dataset_list),
+        asyncio.to_thread(load_resolved_datasets, config_file),
+    )
+    enriched = {info.name: info.model_dump() for info in dataset_list}
+    # Relative boundary paths are relative to the config dir's parent
+    base_dir = str(config_file.parent.parent)
+    boundary_paths = {
+        ds['name']: os.path.join(base_dir, ds['boundary_path'])
+        for ds in resolved if ds['boundary_path']
+    }
+
+    dataset_map = {}
+    for ds in config.get('datasets', []):
+        name = ds['name']
+        api_ds = enriched.get(name, {})
+
+        # Heuristic for center if not provided anywhere
+        default_center = [37.08, -84.61]  # Somerset
+        if "Burnaby" in name or "Vancouver" in name:
+            default_center = [49.25, -123.00]
+
+        # Priority: 1. Local Config, 2. Enriched, 3. Heuristic
+        dataset_map[name] = {
+            'name': ds.get('description') or api_ds.get('description') or name,
+            'short_name': ds.get('short_name') or api_ds.get('short_name') or name,
+            'center': ds.get('center') or api_ds.get('center') or default_center,
+            'zoom': ds.get('zoom') or api_ds.get('zoom') or 13,
+            'boundary': api_ds.get('boundary')
+        }
+
+    boundaries = await asyncio.gather(*(
+        asyncio.to_thread(_ui_boundary, name, entry['boundary'], boundary_paths.get(name))
+        for name, entry in dataset_map.items()
+    ))
+    for (name, entry), boundary in zip(dataset_map.items(), boundaries):
+        entry['boundary'] = boundary
+        entry['boundary_tiles'] = boundary_tiles_path(boundary_paths.get(name))
+    return dataset_map
+
+
+def _ui_boundary(name: str, boundary: Optional[Dict], boundary_path: Optional[str]) -> Optional[Dict]:
+    """Simplified database boundary, else the boundary file's, else None."""
+    try:
+        if boundary:
+            return simplify_geojson(boundary)
+        if boundary_path:
+            return load_boundary(boundary_path)
+    except Exception as e:
+        logger.error(f"Failed to load boundary for {name}: {e}")
+    return boundary
+
+
 @app.get("/nearest-edge", response_model=NearestEdgeResponse)
 async def find_nearest_edge(
     lat: float = Query(..., description="Latitude"),
@@ -250,7 +805,7 @@ async def find_nearest_edge(
     dataset: str = Query(..., description="Dataset name")
 ):
     """Find the nearest edge to given coordinates."""
-    if dataset not in registry.list_datasets():
+    if not registry.has_dataset(dataset):
         raise HTTPException(status_code=404, detail=f"Dataset not found: {dataset}")
     
     try:
@@ -282,12 +837,11 @@ async def find_nearest_edges(
     k: int = Query(5, description="Number of nearest edges to return", ge=1, le=20)
 ):
     """Find k nearest edges to given coordinates using C++ server."""
-    if dataset not in registry.list_datasets():
+    if not registry.has_dataset(dataset):
         raise HTTPException(status_code=404, detail=f"Dataset not found: {dataset}")
     
     try:
         # Forward request to C++ server
-        server_url = "http://localhost:8082"
         params = {
             "dataset": dataset,
             "lat": lat,
@@ -295,12 +849,15 @@ async def find_nearest_edges(
             "k": k
         }
         
-        response = requests.get(f"{server_url}/nearest_edges", params=params, timeout=10)
-        data = response.json()
-        
-        return data
+        # The body is not inspected, so pass the C++ server's bytes through unparsed
+        response = await app.state.http.get("/nearest_edges", params=params)
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/json"),
+        )
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error calling C++ server: {e}")
         raise HTTPException(status_code=503, detail=f"C++ server error: {str(e)}")
     except Exception as e:
@@ -308,61 +865,83 @@ async def find_nearest_edges(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+Latitude = confloat(ge=-90, le=90)
+Longitude = confloat(ge=-180, le=180)
+
+# (current name, legacy name) of each route coordinate
+COORDINATE_ALIASES = (
+    ("source_lat", "start_lat"),
+    ("source_lon", "start_lng"),
+    ("target_lat", "end_lat"),
+    ("target_lon", "end_lng"),
+)
+
+
+class RouteQuery(BaseModel):
+    """Route coordinates under their current or legacy names."""
+    source_lat: Optional[Latitude] = None
+    source_lon: Optional[Longitude] = None
+    target_lat: Optional[Latitude] = None
+    target_lon: Optional[Longitude] = None
+    start_lat: Optional[Latitude] = None  # Legacy
+    start_lng: Optional[Longitude] = None  # Legacy
+    end_lat: Optional[Latitude] = None    # Legacy
+    end_lng: Optional[Longitude] = None   # Legacy
+
+    @model_validator(mode="after")
+    def _resolve_legacy_names(self):
+        """Prefer the current names, fall back to the legacy ones."""
+        for name, legacy in COORDINATE_ALIASES:
+            if getattr(self, name) is None:
+                setattr(self, name, getattr(self, legacy))
+        return self
+
+    def missing_coordinates(self) -> List[str]:
+        return [f"{name}/{legacy}" for name, legacy in COORDINATE_ALIASES
+                if getattr(self, name) is None]
+
+
 @app.get("/route", response_model=RouteResponse)
 async def compute_route(
-    # Preferred/current parameter names
-    source_lat: Optional[float] = Query(None, description="Source latitude (preferred)"),
-    source_lon: Optional[float] = Query(None, description="Source longitude (preferred)"),
-    target_lat: Optional[float] = Query(None, description="Target latitude (preferred)"),
-    target_lon: Optional[float] = Query(None, description="Target longitude (preferred)"),
-    # Legacy parameter names (kept for backward compatibility)
-    start_lat: Optional[float] = Query(None, description="Legacy: start latitude"),
-    start_lng: Optional[float] = Query(None, description="Legacy: start longitude"),
-    end_lat: Optional[float] = Query(None, description="Legacy: end latitude"),
-    end_lng: Optional[float] = Query(None, description="Legacy: end longitude"),
+    request: Request,
+    coords: Annotated[RouteQuery, Depends()],
     dataset: str = Query(..., description="Dataset name"),
     search_mode: str = Query("knn", description="Search mode: 'knn', 'one_to_one', or 'one_to_one_v2'"),
     num_candidates: int = Query(3, description="Number of candidates for KNN", ge=1, le=10),
     search_radius: float = Query(2000.0, description="Search radius in meters", ge=10.0, le=10000.0),
     algorithm: str = Query("pruned", description="Routing algorithm: 'pruned', 'classic', 'unidirectional', 'dijkstra', and _sp variants"),
     include_alternative: bool = Query(False, description="Whether to include an alternative route"),
-    penalty_factor: float = Query(2.0, description="Penalty factor for alternative route")
+    penalty_factor: float = Query(2.0, description="Penalty factor for alternative route"),
+    include_geojson: bool = Query(True, description="Whether to build the route GeoJSON (skip when only distance/path are needed)")
 ):
     """
     Compute a route between Source and Target.
     Delegates to the C++ routing engine.
     """
-    if dataset not in registry.list_datasets():
+    if not registry.has_dataset(dataset):
         return RouteResponse(success=False, error=f"Dataset not found: {dataset}")
     
     # Updated validation to allow new modes/algorithms
     # Note: mapping happens in ch_query.py, so we just need to let them pass here
-    pass
     # if search_mode not in ['knn', 'one_to_one', 'one_to_one_v2', 'dijkstra']:
     #     return RouteResponse(success=False, error="search_mode must be 'knn', 'one_to_one', 'one_to_one_v2', or 'dijkstra'")
     
     try:
-        # Resolve coordinate parameters: prefer current names, fall back to legacy names
-        def pick(primary: Optional[float], legacy: Optional[float]) -> Optional[float]:
-            return primary if primary is not None else legacy
-
-        src_lat = pick(source_lat, start_lat)
-        src_lon = pick(source_lon, start_lng)
-        tgt_lat = pick(target_lat, end_lat)
-        tgt_lon = pick(target_lon, end_lng)
-
-        # Validate presence of coordinates
-        missing = []
-        if src_lat is None:
-            missing.append('source_lat/start_lat')
-        if src_lon is None:
-            missing.append('source_lon/start_lng')
-        if tgt_lat is None:
-            missing.append('target_lat/end_lat')
-        if tgt_lon is None:
-            missing.append('target_lon/end_lng')
+        # Coordinates are range-checked and resolved from legacy names by RouteQuery
+        missing = coords.missing_coordinates()
         if missing:
             return RouteResponse(success=False, error=f"Missing required coordinate parameters: {', '.join(missing)}")
+        src_lat, src_lon = coords.source_lat, coords.source_lon
+        tgt_lat, tgt_lon = coords.target_lat, coords.target_lon
+
+        cache_key = _route_cache_key(
+            dataset, src_lat, src_lon, tgt_lat, tgt_lon, search_mode, algorithm,
+            num_candidates, search_radius, include_alternative, penalty_factor, include_geojson
+        )
+        cached = _route_cache_get(cache_key)
+        if cached is not None:
+            return etag_response(cached, request, ROUTE_CACHE_CONTROL)
+
         # Get CH query engine
         try:
             ch_engine = ch_factory.get_engine(dataset)
@@ -370,8 +949,9 @@ async def compute_route(
             return RouteResponse(success=False, error=f"Query engine not available for dataset: {dataset}")
         
         # Delegate full routing to the high-performance routing server
-        # The server handles nearest neighbor search and pathfinding internally
-        result = ch_engine.compute_route_latlon(
+        # The server handles nearest neighbor search and pathfinding internally.
+        outcome = await route_body(
+            cache_key, ch_engine, dataset, include_geojson,
             start_lat=src_lat,
             start_lng=src_lon,
             end_lat=tgt_lat,
@@ -383,56 +963,26 @@ async def compute_route(
             include_alternative=include_alternative,
             penalty_factor=penalty_factor
         )
-        
-        if not result.success:
-            return RouteResponse(success=False, error=result.error or "Routing failed")
-            
+        if isinstance(outcome, RouteResponse):
+            return outcome
         # The GeoJSON is now propagated from the server via the SDK
-        feature = result.geojson
-        
-        # Fallback if server didn't return geojson (should not happen with new server)
-        if not feature:
-            feature = {
-                "type": "Feature",
-                "geometry": {"type": "LineString", "coordinates": []},
-                "properties": {"distance": result.distance, "warning": "No geometry returned"}
-            }
-        
-        return RouteResponse(
-            success=True,
-            dataset=dataset,
-            distance=result.distance,
-            distance_meters=result.distance_meters,
-            runtime_ms=result.runtime_ms,
-            path=result.path,
-            geojson=feature,
-            timing_breakdown=result.timing_breakdown,
-            debug=result.debug,
-            alternative_route=result.alternative_route
-        )
+        return etag_response(outcome, request, ROUTE_CACHE_CONTROL)
     
     except Exception as e:
         logger.error(f"Error computing route: {e}", exc_info=True)
         return RouteResponse(success=False, error=f"Internal server error: {str(e)}")
 
 
-class RouteRequest(BaseModel):
+class RouteRequest(RouteQuery):
     """Request body for POST /route."""
     dataset: str
-    source_lat: Optional[float] = None
-    source_lon: Optional[float] = None
-    target_lat: Optional[float] = None
-    target_lon: Optional[float] = None
-    start_lat: Optional[float] = None  # Legacy
-    start_lng: Optional[float] = None  # Legacy
-    end_lat: Optional[float] = None    # Legacy
-    end_lng: Optional[float] = None    # Legacy
     search_mode: str = "knn"
     num_candidates: int = 3
     search_radius: float = 2000.0
     algorithm: str = "pruned"
     include_alternative: bool = False
     penalty_factor: float = 2.0
+    include_geojson: bool = True
 
 
 @app.post("/route", response_model=RouteResponse)
@@ -448,17 +998,23 @@ async def compute_route_post(request: RouteRequest):
         except KeyError:
             return RouteResponse(success=False, error=f"Query engine not available for dataset: {request.dataset}")
 
-        # Resolve coordinates
-        src_lat = request.source_lat if request.source_lat is not None else request.start_lat
-        src_lon = request.source_lon if request.source_lon is not None else request.start_lng
-        tgt_lat = request.target_lat if request.target_lat is not None else request.end_lat
-        tgt_lon = request.target_lon if request.target_lon is not None else request.end_lng
-
-        if any(v is None for v in [src_lat, src_lon, tgt_lat, tgt_lon]):
+        src_lat, src_lon = request.source_lat, request.source_lon
+        tgt_lat, tgt_lon = request.target_lat, request.target_lon
+        if request.missing_coordinates():
             return RouteResponse(success=False, error="Missing coordinate parameters")
 
+        cache_key = _route_cache_key(
+            request.dataset, src_lat, src_lon, tgt_lat, tgt_lon, request.search_mode,
+            request.algorithm, request.num_candidates, request.search_radius,
+            request.include_alternative, request.penalty_factor, request.include_geojson
+        )
+        cached = _route_cache_get(cache_key)
+        if cached is not None:
+            return json_bytes_response(cached)
+
         # Delegate to engine (handles mapping logic correctly)
-        result = ch_engine.compute_route_latlon(
+        outcome = await route_body(
+            cache_key, ch_engine, request.dataset, request.include_geojson,
             start_lat=src_lat,
             start_lng=src_lon,
             end_lat=tgt_lat,
@@ -470,30 +1026,9 @@ async def compute_route_post(request: RouteRequest):
             include_alternative=request.include_alternative,
             penalty_factor=request.penalty_factor
         )
-        
-        if not result.success:
-            return RouteResponse(success=False, error=result.error or "Routing failed")
-            
-        feature = result.geojson
-        if not feature:
-            feature = {
-                "type": "Feature",
-                "geometry": {"type": "LineString", "coordinates": []},
-                "properties": {"distance": result.distance, "warning": "No geometry returned"}
-            }
-            
-        return RouteResponse(
-            success=True,
-            dataset=request.dataset,
-            distance=result.distance,
-            distance_meters=result.distance_meters,
-            runtime_ms=result.runtime_ms,
-            path=result.path,
-            geojson=feature,
-            timing_breakdown=result.timing_breakdown,
-            debug=result.debug,
-            alternative_route=result.alternative_route
-        )
+        if isinstance(outcome, RouteResponse):
+            return outcome
+        return json_bytes_response(outcome)
 
     except Exception as e:
         logger.error(f"Error computing route: {e}", exc_info=True)
@@ -501,6 +1036,51 @@ async def compute_route_post(request: RouteRequest):
 
 
 
+class EdgePair(BaseModel):
+    source_edge: int
+    target_edge: int
+
+
+class RouteBatchRequest(BaseModel):
+    """Request body for POST /route_batch."""
+    dataset: str
+    queries: List[EdgePair]
+    algorithm: str = "pruned"
+    include_geojson: bool = False
+
+
+@app.post("/route_batch")
+async def route_batch(request: RouteBatchRequest):
+    """
+    Route many (source_edge, target_edge) pairs in one call.
+    Forwards to the C++ server's /route_batch; results keep the query order.
+    """
+    if not registry.has_dataset(request.dataset):
+        raise HTTPException(status_code=404, detail=f"Dataset not found: {request.dataset}")
+
+    try:
+        payload = {
+            "dataset": request.dataset,
+            "queries": [{"source_edge": q.source_edge, "target_edge": q.target_edge} for q in request.queries],
+            "algorithm": request.algorithm,
+            "include_geojson": request.include_geojson
+        }
+        response = await app.state.http.post("/route_batch", json=payload, timeout=60)
+    except httpx.HTTPError as e:
+        logger.error(f"Error calling C++ server: {e}")
+        raise HTTPException(status_code=503, detail=f"C++ server error: {str(e)}") from e
+
+    if response.status_code == 404:
+        # Engine build without the endpoint (its 404 body is not JSON)
+        raise HTTPException(status_code=404, detail="Routing engine does not support /route_batch")
+    # The body is not inspected, so pass the C++ server's bytes through unparsed
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json"),
+    )
+
+
 class LoadDatasetRequest(BaseModel):
     dataset: str
     schema_name: Optional[str] = None  # Optional schema override
@@ -508,8 +1088,13 @@ class LoadDatasetRequest(BaseModel):
 @app.post("/load-dataset")
 async def load_dataset_endpoint(request: LoadDatasetRequest):
     """Load a dataset into the C++ server."""
+    global _datasets_cache, _bootstrap_cache, _status_cache
+    _datasets_cache = None
+    _bootstrap_cache = None
+    _status_cache = None
+    invalidate_route_cache()
     dataset = request.dataset
-    if dataset not in registry.list_datasets():
+    if not registry.has_dataset(dataset):
         raise HTTPException(status_code=404, detail=f"Dataset not found in registry: {dataset}")
     
     info = registry.get_dataset_info(dataset)
@@ -536,46 +1121,99 @@ async def load_dataset_endpoint(request: LoadDatasetRequest):
             raise HTTPException(status_code=500, detail="Invalid dataset config: missing paths")
         
         logger.info(f"Sending load payload: {json.dumps(payload)}")
-        resp = requests.post("http://localhost:8082/load_dataset", json=payload, timeout=180)
+        try:
+            resp = await app.state.http.post("/load_dataset", json=payload, timeout=180)
+        finally:
+            # Routes computed while the engine was loading are stale too
+            invalidate_route_cache()
         
         if resp.status_code == 200:
             return {"success": True, "message": f"Dataset {dataset} loaded"}
         else:
             raise HTTPException(status_code=400, detail=f"Failed to load dataset: {resp.text}")
             
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"C++ server error: {str(e)}")
 
 
 @app.post("/unload-dataset")
 async def unload_dataset_endpoint(request: LoadDatasetRequest):
     """Unload a dataset from the C++ server."""
+    global _datasets_cache, _bootstrap_cache, _status_cache
+    _datasets_cache = None
+    _bootstrap_cache = None
+    _status_cache = None
+    invalidate_route_cache()
     dataset = request.dataset
     
     # Proxy to C++ server
     try:
         payload = {"dataset": dataset}
-        resp = requests.post("http://localhost:8082/unload_dataset", json=payload, timeout=10)
+        try:
+            resp = await app.state.http.post("/unload_dataset", json=payload)
+        finally:
+            invalidate_route_cache()
         
         if resp.status_code == 200:
             return {"success": True, "message": f"Dataset {dataset} unloaded"}
         else:
             raise HTTPException(status_code=400, detail=f"Failed to unload dataset: {resp.text}")
             
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"C++ server error: {str(e)}")
 
 @app.get("/server-status")
-async def server_status():
-    """Get C++ server status and loaded datasets."""
+async def server_status(request: Request):
+    """
+    Get C++ server status and loaded datasets.
+
+    The answer is reused for SERVER_STATUS_TTL seconds, and concurrent
+    pollers share a single in-flight /health call. Pollers revalidate with
+    If-None-Match and get a 304 while the status is unchanged.
+    """
+    return etag_response(_dumps(await _server_status()), request, {"Cache-Control": "no-cache"})
+
+
+async def _server_status() -> Dict:
+    global _status_inflight
+    if _status_cache is not None and time.monotonic() - _status_cache[0] < SERVER_STATUS_TTL:
+        return _status_cache[1]
+    if _status_inflight is None:
+        _status_inflight = asyncio.ensure_future(_fetch_server_status())
+    # shield: a disconnecting poller must not cancel the others' fetch
+    return await asyncio.shield(_status_inflight)
+
+
+async def _fetch_server_status() -> Dict:
+    global _status_cache, _status_inflight
     try:
-        resp = requests.get("http://localhost:8082/health", timeout=2)
-        if resp.status_code == 200:
-            return resp.json()
-        else:
-            return {"status": "error", "error": f"C++ server returned {resp.status_code}"}
-    except Exception as e:
-        return {"status": "down", "error": str(e)}
+        try:
+            resp = await app.state.http.get("/health", timeout=2)
+            if resp.status_code == 200:
+                payload = resp.json()
+            else:
+                payload = {"status": "error", "error": f"C++ server returned {resp.status_code}"}
+        except Exception as e:
+            payload = {"status": "down", "error": str(e)}
+        _status_cache = (time.monotonic(), payload)
+        return payload
+    finally:
+        _status_inflight = None
+
+
+# Lines of the C++ CLI output read by parse_cpp_output()
+_RE_DISTANCE = re.compile(r"Distance[^:\n]*(?:including destination edge|total including)[^:\n]*:\s*([^\s:]+)")
+_RE_RUNTIME = re.compile(r"Runtime:\s*([0-9.]+)")
+_RE_EXPANDED_PATH = re.compile(r"Expanded (?:base edge )?path:([^\n]*)")
+_RE_EDGE_ID = re.compile(r"\d+")
+
+
+def _last_match(pattern: re.Pattern, text: str) -> Optional[str]:
+    """First group of the last match of pattern in text, or None."""
+    value = None
+    for m in pattern.finditer(text):
+        value = m.group(1)
+    return value
 
 
 def parse_cpp_output(output: str) -> tuple:
@@ -596,38 +1234,22 @@ def parse_cpp_output(output: str) -> tuple:
         (path, distance, runtime_ms) or (None, None, None) if parsing fails
     """
     try:
-        lines = output.strip().split('\n')
-        
-        distance = None
-        runtime_ms = None
-        path = None
+        if "No path found" in output:
+            return None, None, None
         
-        for line in lines:
-            line = line.strip()
-            
-            if "No path found" in line:
-                return None, None, None
-            
-            # Handle both single query and multi-query output formats
-            if "Distance" in line and ("including destination edge" in line or "total including" in line):
-                distance = float(line.split(':')[1].strip())
-            
-            elif "Runtime:" in line:
-                runtime_str = line.split(':')[1].strip().replace('ms', '').strip()
-                runtime_ms = float(runtime_str)
-            
-            elif "Expanded path:" in line or "Expanded base edge path:" in line:
-                # Extract path: "1593 -> 34486 -> 24508 -> 4835"
-                path_str = line.split(':')[1].strip()
-                # Handle both full paths and truncated paths with "..."
-                path_str = path_str.replace('...', '')
-                path_parts = [p.strip() for p in path_str.split('->')]
-                path = [int(p) for p in path_parts if p and p.isdigit()]
+        # Multi-query output repeats these lines; the last occurrence wins
+        distance = _last_match(_RE_DISTANCE, output)
+        runtime = _last_match(_RE_RUNTIME, output)
+        path_str = _last_match(_RE_EXPANDED_PATH, output)
         
-        if path is None:
+        if path_str is None:
             logger.warning("Failed to parse path from C++ output")
             return None, None, None
         
+        # Handles both full paths and truncated paths with "..."
+        path = [int(p) for p in _RE_EDGE_ID.findall(path_str)]
+        distance = float(distance) if distance is not None else None
+        runtime_ms = float(runtime) if runtime is not None else None
         return path, distance, runtime_ms
     
     except Exception as e:
@@ -679,4 +1301,15 @@ def build_geojson(path: List[int], spatial_idx) -> Dict:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools when installed. Each worker runs the lifespan, so it
+    # gets its own httpx pool, but the route/status/datasets caches are also
+    # per worker and load/unload only clears the worker that served it.
+    uvicorn.run(
+        "api.server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WORKERS", "1")),
+        loop="auto",
+        http="auto",
+        limit_concurrency=1000,
+    )
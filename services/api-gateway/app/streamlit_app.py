@@ -1,6 +1,16 @@
+import json
+import os
+
+import requests
+import yaml
 import streamlit as st
 import streamlit.components.v1 as components
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # --- 1. SET PAGE CONFIGURATION ---
 st.set_page_config(
     layout="wide", 
@@ -37,113 +47,64 @@ st.markdown("""
 # API_URL = "http://localhost:8080/route"
 
 # Use routing-pipeline Python API (Gateway to C++ server)
-API_URL = "http://localhost:8000/route"
+# API_BASE_URL is how this process reaches the gateway (e.g. http://api:8000
+# under docker-compose); PUBLIC_API_BASE_URL is how the browser reaches it
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000").rstrip("/")
+PUBLIC_API_BASE_URL = os.getenv("PUBLIC_API_BASE_URL", API_BASE_URL).rstrip("/")
+API_URL = f"{API_BASE_URL}/route"
 
 # For testing: API_URL = "https://router.project-osrm.org/route/v1/driving" 
 
 # --- 2b. CONFIG LOADING ---
-import yaml
-import json
-import os
-import requests
-from pathlib import Path
-
-# Removed @st.cache_data to allow dynamic updates from datasets.yaml
-def load_config():
-    # Resolve path relative to this script file
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, "..", "config", "datasets.yaml")
+# The gateway merges datasets.yaml, the enriched dataset metadata and the
+# boundaries into one document. Streamlit reruns this script on every
+# interaction, so the result is cached. Failures raise, so they are not
+# cached: the next rerun asks the gateway again.
+config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "datasets.yaml")
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_dataset_map():
+    """Fetch the dataset map (config + enriched metadata + boundaries) from the API."""
+    resp = requests.get(f"{API_BASE_URL}/bootstrap", timeout=5)
+    resp.raise_for_status()
+    return resp.json()
+
+@st.cache_data(show_spinner=False)
+def load_local_dataset_map(mtime: float):
+    """Dataset map from the local datasets.yaml alone (no metadata or boundaries)."""
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    return config
-
-config_data = load_config()
-datasets = config_data.get('datasets', [])
-paths_config = config_data.get('paths', {})
-
-# Auto-detect project root: .../services/api-gateway/app/streamlit_app.py -> 3 levels up -> project_root
-# Assuming streamlit_app.py is in services/api-gateway/app/
-project_root = Path(__file__).resolve().parents[3]
-
-# Context for resolution
-resolution_context = {"project_root": str(project_root)}
-
-# 1. Resolve paths_config first
-resolved_paths = {}
-if paths_config:
-    for key, value in paths_config.items():
-        if isinstance(value, str):
-            resolved_paths[key] = value.format(**resolution_context)
-    # Update context with resolved paths
-    resolution_context.update(resolved_paths)
-
-script_dir = os.path.dirname(os.path.abspath(__file__))
-
-def fetch_api_datasets():
-    """Fetch enriched dataset metadata from the API."""
+        config = yaml.safe_load(f) or {}
+    dataset_map = {}
+    for ds in config.get('datasets', []):
+        name = ds['name']
+        default_center = [37.08, -84.61]  # Somerset
+        if "Burnaby" in name or "Vancouver" in name:
+            default_center = [49.25, -123.00]
+        dataset_map[name] = {
+            'name': ds.get('description') or name,
+            'short_name': ds.get('short_name') or name,
+            'center': ds.get('center') or default_center,
+            'zoom': ds.get('zoom') or 13,
+            'has_boundary': False,
+            'boundary_tiles': False,
+        }
+    return dataset_map
+
+try:
+    dataset_map = fetch_dataset_map()
+except Exception as e:
+    print(f"DEBUG: Could not fetch dataset map from API ({e}), using {config_path}")
     try:
-        resp = requests.get("http://localhost:8000/datasets", timeout=2)
-        if resp.ok:
-            return resp.json()
+        dataset_map = load_local_dataset_map(os.path.getmtime(config_path))
     except Exception as e:
-        print(f"DEBUG: Could not fetch datasets from API: {e}")
-    return []
-
-api_datasets = fetch_api_datasets()
-api_dataset_map = {ds['name']: ds for ds in api_datasets}
-
-# Convert datasets list to a dict for easier access, and load boundaries
-dataset_map = {}
-for ds in datasets:
-    name = ds['name']
-    api_ds = api_dataset_map.get(name, {})
-    
-    # Heuristic for center if not provided anywhere
-    default_center = [37.08, -84.61] # Somerset
-    if "Burnaby" in name or "Vancouver" in name:
-        default_center = [49.25, -123.00] 
-    
-    # Priority: 1. Local Config, 2. API Enriched, 3. Heuristic
-    center = ds.get('center') or api_ds.get('center') or default_center
-    zoom = ds.get('zoom') or api_ds.get('zoom') or 13
-    boundary = api_ds.get('boundary') # Boundary usually comes from API enrichment (WKT/GeoJSON in DB)
-    
-    short_name = ds.get('short_name') or api_ds.get('short_name') or name
-    description = ds.get('description') or api_ds.get('description') or name
-
-    ds_entry = {
-        'name': description,
-        'short_name': short_name,
-        'center': center,
-        'zoom': zoom,
-        'boundary': boundary
-    }
-    
-    # Load boundary from local file if specified and not already provided by API
-    if not ds_entry['boundary'] and 'boundary_path' in ds:
-        raw_path = ds['boundary_path']
-        if resolution_context:
-            raw_path = raw_path.format(**resolution_context)
-            
-        boundary_path = raw_path
-        if not os.path.isabs(boundary_path):
-             boundary_path = os.path.join(os.path.dirname(script_dir), boundary_path)
-
-        if os.path.exists(boundary_path):
-            try:
-                with open(boundary_path, 'r') as f:
-                    ds_entry['boundary'] = json.load(f)
-                print(f"DEBUG: Loaded local boundary for {name} from {boundary_path}")
-            except Exception as e:
-                print(f"ERROR: Failed to load local boundary {boundary_path}: {e}")
-    
-    # Use the EXACT name from config as key to match what we send to backend
-    dataset_map[name] = ds_entry
+        print(f"ERROR: Could not read {config_path}: {e}")
+        dataset_map = {}
 
 # --- JAVASCRIPT & HTML APPLICATION ---
 # The internal component CSS already forces 100vh/100vw, but is now enforced by the outer container.
+# The dataset config is spliced in at the __JSON_CONFIG_PLACEHOLDER__ token by render_html().
 
-html_code = f"""
+HTML_TEMPLATE = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -326,25 +287,21 @@ html_code = f"""
         </div>
     </div>
     
-    <!-- DEBUG: Output config to verify loading -->
-    <div style="display:none;" id="debug-config">
-    __JSON_CONFIG_PLACEHOLDER__
-    </div>
-    
     <div id="map-wrapper">
         <div id="map"></div>
     </div>
 
     <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+    <script src="https://unpkg.com/protomaps-leaflet@4.0.1/dist/protomaps-leaflet.js"></script>
 
     <script>
         // --- 0. CONFIGURATION & DROPDOWN ---
         const datasetConfig = __JSON_CONFIG_PLACEHOLDER__;
         var currentLoadedDatasets = []; // Track loaded status globally
 
-        // HELPER: API URL - hardcoded for reliability
+        // HELPER: API URL (PUBLIC_API_BASE_URL, spliced in by render_html)
         function getApiBase() {{
-            return "http://localhost:8000";
+            return __API_BASE_PLACEHOLDER__;
         }}
 
         const selector = document.getElementById('dataset-selector');
@@ -356,6 +313,14 @@ html_code = f"""
             opt.textContent = datasetConfig[key].short_name || key; // Use short name
             selector.appendChild(opt);
         }});
+        const hasDatasets = selector.options.length > 0;
+        if (!hasDatasets) {{
+            const opt = document.createElement('option');
+            opt.value = '';
+            opt.textContent = 'No datasets available';
+            selector.appendChild(opt);
+            selector.disabled = true;
+        }}
 
         // --- DOM ELEMENTS ---
         const sidebar = document.getElementById('sidebar');
@@ -378,7 +343,9 @@ html_code = f"""
         }}
 
         // --- 1. SETUP MAP ---
-        var map = L.map('map', {{ zoomControl: false }}).setView([49.23, -122.96], 13);
+        // Vector layers draw on one shared canvas: long routes would otherwise be large SVG paths
+        var canvasRenderer = L.canvas({{ padding: 0.5 }});
+        var map = L.map('map', {{ zoomControl: false, preferCanvas: true, renderer: canvasRenderer }}).setView([49.23, -122.96], 13);
         L.tileLayer('https://{{s}}.basemaps.cartocdn.com/light_all/{{z}}/{{x}}/{{y}}{{r}}.png', {{
             attribution: '&copy; OpenStreetMap contributors'
         }}).addTo(map);
@@ -394,8 +361,39 @@ html_code = f"""
         var altRouteLayer = null;
         var debugLayer = L.layerGroup().addTo(map);
         
+        // GeoJSON [lon, lat] pairs -> Leaflet [lat, lon], into a pre-sized array
+        function flipCoords(src) {{
+            const n = src.length;
+            const dst = new Array(n);
+            for (let i = 0; i < n; i++) {{
+                const c = src[i];
+                dst[i] = [c[1], c[0]];
+            }}
+            return dst;
+        }}
+
+        // Recent successful /route responses, oldest first (Map keeps insertion order)
+        const ROUTE_CACHE_SIZE = 64;
+        const routeCache = new Map();
+
+        // Long routes are drawn ROUTE_CHUNK vertices per animation frame, so
+        // the first part shows after one frame and the page stays responsive
+        const ROUTE_CHUNK = 2000;
+
+        function growPolyline(layer, coords) {{
+            let end = ROUTE_CHUNK;
+            function step() {{
+                // Stop if the layer was replaced or removed meanwhile
+                if (end >= coords.length || !map.hasLayer(layer)) return;
+                end = Math.min(end + ROUTE_CHUNK, coords.length);
+                layer.setLatLngs(coords.slice(0, end));
+                requestAnimationFrame(step);
+            }}
+            requestAnimationFrame(step);
+        }}
+
         // --- 3. API FUNCTION ---
-        async function fetchRoute(latA, lonA, latB, lonB) {{
+        async function fetchRoute(latA, lonA, latB, lonB, signal) {{
             loader.style.display = 'block';
             
             // Get selected parameters
@@ -410,34 +408,27 @@ html_code = f"""
             const includeAlternative = document.getElementById('include-alternative').checked;
             const penaltyFactor = parseFloat(document.getElementById('penalty-factor').value);
 
+            // Coordinates rounded to ~10 m: nearby drags snap to the same
+            // edges, so their routes are reused without a request
+            const cacheKey = [
+                dataset, targetAlgo, targetMode, numCandidates,
+                latA.toFixed(4), lonA.toFixed(4), latB.toFixed(4), lonB.toFixed(4),
+                includeAlternative, penaltyFactor
+            ].join('|');
+
             try {{
                 // Determine API URL dynamically using helper
                 const apiBase = getApiBase();
                 
-                let response;
-                if (includeAlternative) {{
-                    // Use POST to include alternative route
-                    const url = `${{apiBase}}/route`;
-                    console.log("Fetching route (POST with alternative) from:", url);
-                    response = await fetch(url, {{
-                        method: 'POST',
-                        headers: {{ 'Content-Type': 'application/json' }},
-                        body: JSON.stringify({{
-                            dataset: dataset,
-                            source_lat: latA,
-                            source_lon: lonA,
-                            target_lat: latB,
-                            target_lon: lonB,
-                            search_radius: searchRadius,
-                            num_candidates: parseInt(numCandidates),
-                            search_mode: targetMode,
-                            algorithm: targetAlgo,
-                            include_alternative: true,
-                            penalty_factor: penaltyFactor
-                        }})
-                    }});
+                let data = routeCache.get(cacheKey);
+                if (data) {{
+                    // Re-insert so the entry counts as most recently used
+                    routeCache.delete(cacheKey);
+                    routeCache.set(cacheKey, data);
                 }} else {{
-                    // Use GET for standard routing
+                    // One GET for both variants: the URL is stable, so the
+                    // browser cache (Cache-Control from the gateway) can answer
+                    // repeats, e.g. when the alternative toggle is switched back
                     const params = new URLSearchParams({{
                         dataset: dataset,
                         source_lat: latA,
@@ -449,14 +440,24 @@ html_code = f"""
                         search_mode: targetMode,
                         algorithm: targetAlgo
                     }});
+                    if (includeAlternative) {{
+                        params.append('include_alternative', 'true');
+                        params.append('penalty_factor', penaltyFactor);
+                    }}
                     const url = `${{apiBase}}/route?${{params.toString()}}`;
                     console.log("Fetching route (GET) from:", url);
-                    response = await fetch(url, {{
+                    const response = await fetch(url, {{
                         method: 'GET',
-                        headers: {{ 'Content-Type': 'application/json' }}
+                        signal: signal
                     }});
+                    data = await response.json();
+                    if (data.success) {{
+                        routeCache.set(cacheKey, data);
+                        if (routeCache.size > ROUTE_CACHE_SIZE) {{
+                            routeCache.delete(routeCache.keys().next().value);
+                        }}
+                    }}
                 }}
-                const data = await response.json();
 
                 console.log("API Response:", data);
                 
@@ -484,17 +485,14 @@ html_code = f"""
                         if (geojson.type === 'FeatureCollection' && geojson.features) {{
                             geojson.features.forEach(feature => {{
                                 if (feature.geometry.type === 'LineString') {{
-                                    feature.geometry.coordinates.forEach(coord => {{
-                                        routeCoords.push([coord[1], coord[0]]);
-                                    }});
+                                    const dst = flipCoords(feature.geometry.coordinates);
+                                    routeCoords = routeCoords.length ? routeCoords.concat(dst) : dst;
                                 }}
                             }});
                         }} 
                         // Handle single Feature (returned by routing-server)
                         else if (geojson.type === 'Feature' && geojson.geometry && geojson.geometry.type === 'LineString') {{
-                            geojson.geometry.coordinates.forEach(coord => {{
-                                routeCoords.push([coord[1], coord[0]]);
-                            }});
+                            routeCoords = flipCoords(geojson.geometry.coordinates);
                         }}
                     }}
                     
@@ -505,28 +503,35 @@ html_code = f"""
                     if (data.debug && data.debug.cells) {{
                         const cells = data.debug.cells;
                         
-                        const addCell = (cellData, color, label) => {{
+                        // One non-interactive GeoJSON layer for all cells; the
+                        // boundaries are already [lon, lat] GeoJSON rings
+                        const features = [];
+                        const addCell = (cellData, color) => {{
                             if (!cellData || !cellData.boundary) return;
-                            // Boundary is [lon, lat], convert to [lat, lon]
-                            const latlngs = cellData.boundary.map(c => [c[1], c[0]]);
-                            L.polygon(latlngs, {{
-                                color: color,
-                                fillColor: color,
-                                fillOpacity: 0.4,
-                                weight: 3
-                            }}).bindTooltip(label + " (Res " + cellData.res + ")").addTo(debugLayer);
+                            features.push({{
+                                type: 'Feature',
+                                properties: {{ c: color }},
+                                geometry: {{ type: 'Polygon', coordinates: [cellData.boundary] }}
+                            }});
                         }};
 
                         console.log("Debug Cells:", cells);
-                        if (cells.source) addCell(cells.source, '#00ff00', "Source");
-                        if (cells.target) addCell(cells.target, '#ff0000', "Target");
-                        if (cells.high) addCell(cells.high, '#0000ff', "High Cell");
+                        addCell(cells.source, '#00ff00');
+                        addCell(cells.target, '#ff0000');
+                        addCell(cells.high, '#0000ff');
+                        L.geoJSON({{ type: 'FeatureCollection', features: features }}, {{
+                            renderer: canvasRenderer,
+                            interactive: false,
+                            style: f => ({{ color: f.properties.c, fillColor: f.properties.c, fillOpacity: 0.4, weight: 3 }})
+                        }}).addTo(debugLayer);
                         
+                        // The cell resolutions used to be polygon tooltips
+                        const cellStatus = c => c ? "Found (Res " + c.res + ")" : "Miss";
                         document.getElementById("debug-info").innerHTML = 
                             "Route found.<br>" +
-                            "Src: " + (cells.source ? "Found" : "Miss") + 
-                            " | Tgt: " + (cells.target ? "Found" : "Miss") + 
-                            " | High: " + (cells.high ? "Found" : "Miss");
+                            "Src: " + cellStatus(cells.source) + 
+                            " | Tgt: " + cellStatus(cells.target) + 
+                            " | High: " + cellStatus(cells.high);
                     }} else {{
                         console.warn("No debug.cells in response");
                         document.getElementById("debug-info").innerHTML = "Found path, but NO debug cells.";
@@ -534,11 +539,13 @@ html_code = f"""
                 }}
                 
                 if (routeCoords.length > 0) {{
-                    routeLayer = L.polyline(routeCoords, {{
+                    routeLayer = L.polyline(routeCoords.slice(0, ROUTE_CHUNK), {{
+                        renderer: canvasRenderer,
                         color: '#0066cc', 
                         weight: 5, 
                         opacity: 0.8
                     }}).addTo(map);
+                    growPolyline(routeLayer, routeCoords);
                 }}
                 
                 // Render alternative route if present
@@ -546,12 +553,11 @@ html_code = f"""
                     const altGeojson = data.alternative_route.geojson;
                     var altCoords = [];
                     if (altGeojson.type === 'Feature' && altGeojson.geometry && altGeojson.geometry.type === 'LineString') {{
-                        altGeojson.geometry.coordinates.forEach(coord => {{
-                            altCoords.push([coord[1], coord[0]]);
-                        }});
+                        altCoords = flipCoords(altGeojson.geometry.coordinates);
                     }}
                     if (altCoords.length > 0) {{
                         altRouteLayer = L.polyline(altCoords, {{
+                            renderer: canvasRenderer,
                             color: '#ff6600',
                             weight: 4,
                             opacity: 0.7,
@@ -627,15 +633,35 @@ html_code = f"""
                     document.getElementById('debug-info').innerText = "Points: " + routeCoords.length + " | Cost: " + costSeconds.toFixed(1) + "s | Len: " + (physicalMeters/1000).toFixed(2) + "km";
                 }}
             }} catch (e) {{
+                // Superseded by a newer request (see scheduleRoute)
+                if (e.name === 'AbortError') return;
                 console.error("Routing error:", e);
                 document.getElementById('disp-time').innerText = "API Error";
                 document.getElementById('disp-dist').innerText = "Check Console";
                 document.getElementById('debug-info').innerText = "Error: " + e.message;
             }} finally {{
-                loader.style.display = 'none';
+                // An aborted request must not hide the loader of the one replacing it
+                if (!inflight || inflight.signal === signal) {{
+                    loader.style.display = 'none';
+                }}
             }}
         }}
 
+        // Route requests are debounced, and a new one aborts the one in flight,
+        // so bursts of drags and setting changes only query the last position
+        const ROUTE_DEBOUNCE_MS = 150;
+        let inflight = null;
+        let debounceTimer = null;
+
+        function scheduleRoute(latA, lonA, latB, lonB) {{
+            clearTimeout(debounceTimer);
+            if (inflight) inflight.abort();
+            debounceTimer = setTimeout(() => {{
+                inflight = new AbortController();
+                fetchRoute(latA, lonA, latB, lonB, inflight.signal);
+            }}, ROUTE_DEBOUNCE_MS);
+        }}
+
         // --- 4. DRAG EVENT LISTENERS ---
         function onDragStart() {{
             // Remove the route immediately when dragging starts
@@ -658,7 +684,7 @@ html_code = f"""
             document.getElementById('coord-b').innerText = posB.lat.toFixed(5) + ', ' + posB.lng.toFixed(5);
 
             // Fetch new route
-            fetchRoute(posA.lat, posA.lng, posB.lat, posB.lng);
+            scheduleRoute(posA.lat, posA.lng, posB.lat, posB.lng);
         }}
 
         markerA.on('dragstart', onDragStart);
@@ -666,13 +692,26 @@ html_code = f"""
         markerA.on('dragend', onDrag);
         markerB.on('dragend', onDrag);
 
+        // Bounds the map would show at center/zoom with its current size
+        function viewBounds(center, zoom) {{
+            const half = map.getSize().divideBy(2);
+            const c = map.project(center, zoom);
+            return L.latLngBounds(map.unproject(c.subtract(half), zoom), map.unproject(c.add(half), zoom));
+        }}
+
         // --- 5. DATASET CHANGE HANDLER ---
         document.getElementById('dataset-selector').addEventListener('change', function() {{
             const newDataset = this.value;
             const config = datasetConfig[newDataset];
+            if (!config) return;
             
-            // Update map center and zoom
-            map.setView(config.center, config.zoom);
+            // Update map center and zoom: a short pan/zoom when the new view
+            // overlaps the current one keeps the tiles already loaded in use
+            if (map.getBounds().intersects(viewBounds(config.center, config.zoom))) {{
+                map.flyTo(config.center, config.zoom, {{ duration: 0.3 }});
+            }} else {{
+                map.setView(config.center, config.zoom);
+            }}
             
             // Reset markers to dataset center
             markerA.setLatLng([config.center[0] - 0.01, config.center[1] - 0.01]);
@@ -696,22 +735,59 @@ html_code = f"""
                 window.currentBoundaryLayer = null;
             }}
             
-            console.log("Boundary data for", newDataset, ":", config.boundary ? "EXISTS" : "NULL");
-            if (config.boundary) {{
-                console.log("Adding boundary layer with", config.boundary.features ? config.boundary.features.length : 0, "features");
-                window.currentBoundaryLayer = L.geoJSON(config.boundary, {{
-                    style: function(feature) {{
-                        return {{
-                            color: "#3388ff",
-                            weight: 2,
-                            opacity: 0.6,
-                            dashArray: '5, 5',
-                            fillOpacity: 0.05
-                        }};
-                    }}
+            showBoundary(newDataset);
+        }});
+
+        // Boundaries are not part of datasetConfig. Datasets with pre-built
+        // vector tiles draw them from the .pmtiles archive (only the tiles in
+        // view are fetched and parsed); the others fetch the GeoJSON the first
+        // time the dataset is selected, then keep it on the config entry
+        async function showBoundary(name) {{
+            const config = datasetConfig[name];
+            if (config.boundary_tiles && window.protomapsL) {{
+                const url = `${{getApiBase()}}/datasets/${{encodeURIComponent(name)}}/boundary.pmtiles`;
+                window.currentBoundaryLayer = protomapsL.leafletLayer({{
+                    url: url,
+                    interactive: false,
+                    paintRules: [
+                        {{ dataLayer: "boundary", symbolizer: new protomapsL.PolygonSymbolizer({{ fill: "#3388ff", opacity: 0.05 }}) }},
+                        {{ dataLayer: "boundary", symbolizer: new protomapsL.LineSymbolizer({{ color: "#3388ff", width: 2, opacity: 0.6, dash: [5, 5] }}) }}
+                    ],
+                    labelRules: []
                 }}).addTo(map);
+                return;
             }}
-        }});
+            if (!config.has_boundary) return;
+            if (!config.boundary) {{
+                try {{
+                    const resp = await fetch(`${{getApiBase()}}/datasets/${{encodeURIComponent(name)}}/boundary`);
+                    if (!resp.ok) return;
+                    config.boundary = await resp.json();
+                }} catch (e) {{
+                    console.warn("Could not fetch boundary for", name, e);
+                    return;
+                }}
+            }}
+            // The selection may have changed while the boundary was loading
+            if (document.getElementById('dataset-selector').value !== name || window.currentBoundaryLayer) return;
+            window.currentBoundaryLayer = L.geoJSON(config.boundary, {{
+                renderer: canvasRenderer,
+                interactive: false,
+                // Leaflet projects a path only on zoom and simplifies it in pixel
+                // space; a dashed outline tolerates a coarser simplification,
+                // which cuts the points drawn on every redraw
+                smoothFactor: 2,
+                style: function(feature) {{
+                    return {{
+                        color: "#3388ff",
+                        weight: 2,
+                        opacity: 0.6,
+                        dashArray: '5, 5',
+                        fillOpacity: 0.05
+                    }};
+                }}
+            }}).addTo(map);
+        }}
         
         // --- 5b. DYNAMIC LOADING LOGIC ---
         var apiRetryCount = 0;
@@ -777,6 +853,7 @@ html_code = f"""
 
         async function loadDataset() {{
             const dataset = document.getElementById('dataset-selector').value;
+            if (!datasetConfig[dataset]) return;
             const statusLabel = document.getElementById('dataset-status-text');
             statusLabel.innerText = "Loading...";
             
@@ -789,6 +866,8 @@ html_code = f"""
                     body: JSON.stringify({{dataset: dataset}})
                 }});
                 if (resp.ok) {{
+                    // Routes from before the load are stale (the gateway clears its LRU too)
+                    routeCache.clear();
                     checkServerStatus();
                     setTimeout(onDrag, 1000); // Trigger route calc
                 }} else {{
@@ -802,6 +881,7 @@ html_code = f"""
 
         async function unloadDataset() {{
             const dataset = document.getElementById('dataset-selector').value;
+            if (!datasetConfig[dataset]) return;
             const statusLabel = document.getElementById('dataset-status-text');
             statusLabel.innerText = "Unloading...";
             
@@ -814,6 +894,7 @@ html_code = f"""
                     body: JSON.stringify({{dataset: dataset}})
                 }});
                 if (resp.ok) {{
+                    routeCache.clear();
                     checkServerStatus();
                     // Clear the map path
                     if (routeLayer) {{
@@ -837,8 +918,11 @@ html_code = f"""
         document.getElementById('btn-load').addEventListener('click', loadDataset);
         document.getElementById('btn-unload').addEventListener('click', unloadDataset);
 
-        // Trigger change to load initial boundary and status
-        document.getElementById('dataset-selector').dispatchEvent(new Event('change'));
+        // Trigger change to load initial boundary and status (nothing to
+        // show when neither the gateway nor datasets.yaml listed a dataset)
+        if (hasDatasets) {{
+            document.getElementById('dataset-selector').dispatchEvent(new Event('change'));
+        }}
         // Initial check too
         setTimeout(checkServerStatus, 500);
 
@@ -889,8 +973,25 @@ html_code = f"""
 </html>
 """
 
-# Inject the component (removed height=900)
-# We use max height/width properties on the containers instead.
-import json
-json_config_str = json.dumps(dataset_map)
-components.html(html_code.replace("__JSON_CONFIG_PLACEHOLDER__", json_config_str), width=2000, height=9999, scrolling=False)
\ No newline at end of file
+@st.cache_data(show_spinner=False)
+def render_html(config_json: str) -> str:
+    """Page HTML for a serialized dataset config (cached, so reruns skip the splice)."""
+    return (HTML_TEMPLATE
+            .replace("__API_BASE_PLACEHOLDER__", json.dumps(PUBLIC_API_BASE_URL))
+            .replace("__JSON_CONFIG_PLACEHOLDER__", config_json))
+
+# The map runs as a fragment: interactions inside it rerun only this function,
+# not the config loading and dataset map build above.
+@st.fragment
+def map_fragment(config_json: str):
+    # Inject the component (removed height=900)
+    # We use max height/width properties on the containers instead.
+    components.html(render_html(config_json), width=2000, height=9999, scrolling=False)
+
+def config_json(config: dict) -> str:
+    """Key-sorted JSON of the dataset config, so equal configs hit render_html's cache."""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(config, sort_keys=True)
+
+map_fragment(config_json(dataset_map))
\ No newline at end of file
@@ -6,8 +6,6 @@ Run this instead of the notebook if VS Code Jupyter is freezing
 
 import subprocess
 import pandas as pd
-import folium
-from shapely import wkt
 import yaml
 from pathlib import Path
 import sys
@@ -1,5 +1,6 @@
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
 
@@ -12,10 +13,15 @@ DATASET = "burnaby" # User mentioned Metro Vancouver, 'burnaby' is usually the d
 # Looking at previous logs, user uses 'burnaby' or similar. 
 # I will check available datasets first.
 
+# One keep-alive session for every call, so timings are not padded with a
+# fresh TCP handshake per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 
 def check_datasets():
     try:
-        resp = requests.get("http://localhost:8000/datasets")
+        resp = SESSION.get("http://localhost:8000/datasets")
         if resp.status_code == 200:
             datasets = [d['name'] for d in resp.json()]
             return datasets
@@ -37,7 +43,7 @@ def run_query(mode, start_lat, start_lon, end_lat, end_lon, dataset):
     }
     
     try:
-        response = requests.get(API_URL, params=params)
+        response = SESSION.get(API_URL, params=params)
         data = response.json()
         if data.get("success"):
             print(json.dumps(data)) # DEBUG
@@ -83,7 +89,7 @@ def main():
     DATASET_NAME = "somerset"
     
     # Ensure dataset is loaded
-    requests.post("http://localhost:8000/load-dataset", json={"dataset": DATASET_NAME})
+    SESSION.post("http://localhost:8000/load-dataset", json={"dataset": DATASET_NAME})
     
     # Update target_dataset for the query to use DATASET_NAME
     target_dataset = DATASET_NAME
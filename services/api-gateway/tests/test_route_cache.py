@@ -0,0 +1,121 @@
+"""
+Route cache and single-flight tests for the gateway, against a stub engine
+(no C++ server needed).
+
+Usage: from services/api-gateway run:
+  python3 -m pytest -q tests/test_route_cache.py
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from api import server
+from api.ch_query import QueryResult
+
+ROUTE_PARAMS = {
+    "dataset": "somerset",
+    "source_lat": 51.5,
+    "source_lon": -2.5,
+    "target_lat": 51.6,
+    "target_lon": -2.4,
+}
+
+
+class StubEngine:
+    """compute_route_latlon() that counts calls and can be held until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.delay = 0.0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def compute_route_latlon(self, include_geojson=True, **query):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(timeout=5)
+        time.sleep(self.delay)
+        return QueryResult(success=True, distance=float(self.calls), path=[1, 2])
+
+
+def engine_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"success": True})
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    stub = StubEngine()
+    monkeypatch.setattr(server.registry, "has_dataset", lambda name: name == "somerset")
+    monkeypatch.setattr(server.registry, "get_dataset_info", lambda name: {"db_path": "/data/somerset.db"})
+    monkeypatch.setattr(server.ch_factory, "get_engine", lambda name: stub)
+    # No lifespan here: give the load/unload proxies a stub C++ server
+    server.app.state.http = httpx.AsyncClient(
+        base_url="http://engine", transport=httpx.MockTransport(engine_handler)
+    )
+    server.invalidate_route_cache()
+    yield stub
+    server.invalidate_route_cache()
+
+
+def run(scenario):
+    """Run scenario(client) on the event loop against the ASGI app."""
+    async def main():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_repeat_route_is_served_from_cache(engine):
+    async def scenario(client):
+        first = await client.get("/route", params=ROUTE_PARAMS)
+        second = await client.get("/route", params=ROUTE_PARAMS)
+        return first, second
+
+    first, second = run(scenario)
+    assert first.json()["success"] is True
+    assert second.content == first.content
+    assert engine.calls == 1
+
+
+@pytest.mark.parametrize("endpoint", ["/load-dataset", "/unload-dataset"])
+def test_load_and_unload_invalidate_cache(engine, endpoint):
+    async def scenario(client):
+        await client.get("/route", params=ROUTE_PARAMS)
+        resp = await client.post(endpoint, json={"dataset": "somerset"})
+        assert resp.status_code == 200
+        return await client.get("/route", params=ROUTE_PARAMS)
+
+    after = run(scenario)
+    assert engine.calls == 2
+    assert after.json()["distance"] == 2.0
+
+
+def test_route_in_flight_during_unload_is_not_cached(engine):
+    engine.release.clear()
+
+    async def scenario(client):
+        stale = asyncio.ensure_future(client.get("/route", params=ROUTE_PARAMS))
+        await asyncio.to_thread(engine.entered.wait, 5)
+        await client.post("/unload-dataset", json={"dataset": "somerset"})
+        engine.release.set()
+        await stale
+        return await client.get("/route", params=ROUTE_PARAMS)
+
+    fresh = run(scenario)
+    assert engine.calls == 2
+    assert fresh.json()["distance"] == 2.0
+
+
+def test_concurrent_identical_routes_share_one_engine_call(engine):
+    engine.delay = 0.2
+
+    async def scenario(client):
+        return await asyncio.gather(*(client.get("/route", params=ROUTE_PARAMS) for _ in range(5)))
+
+    responses = run(scenario)
+    assert engine.calls == 1
+    assert len({r.content for r in responses}) == 1
@@ -621,11 +621,15 @@ int main(int argc, char* argv[]) {
                 penalty_factor = body.value("penalty_factor", 2.0);
             }
             
-            // Check expand param (default true for backward compatibility)
+            // Check expand / include_geojson params (default true for backward compatibility)
             bool expand_path = true;
+            bool include_geojson = true;
             if (req.method == "POST"_method) {
                 auto body = json::parse(req.body);
                 expand_path = body.value("expand", true);
+                include_geojson = body.value("include_geojson", true);
+            } else if (req.url_params.get("include_geojson")) {
+                include_geojson = (std::string(req.url_params.get("include_geojson")) == "true");
             }
             
             Dataset* ds = get_dataset(dataset_name);
@@ -734,7 +738,7 @@ int main(int argc, char* argv[]) {
                     
                     // Timing: Build GeoJSON
                     auto t_geojson_start = std::chrono::high_resolution_clock::now();
-                    geojson = build_geojson(*ds, expanded_path);
+                    if (include_geojson) geojson = build_geojson(*ds, expanded_path);
                     
                     // Trim GeoJSON to match query coordinates
                     if (geojson != nullptr && geojson.contains("geometry")) {
@@ -773,7 +777,7 @@ int main(int argc, char* argv[]) {
                     if (alt_result.reachable) {
                         std::vector<uint32_t> alt_expanded = ds->graph.expand_path(alt_result.path);
                         double alt_dist_meters = calculate_distance_meters(*ds, alt_expanded);
-                        json alt_geojson = build_geojson(*ds, alt_expanded);
+                        json alt_geojson = include_geojson ? build_geojson(*ds, alt_expanded) : json(nullptr);
                         
                         // Trim Alt GeoJSON
                         if (alt_geojson != nullptr && alt_geojson.contains("geometry")) {
@@ -827,7 +831,7 @@ int main(int argc, char* argv[]) {
                     
                     if (alt_result.reachable) {
                         auto alt_expanded = ds->graph.expand_path(alt_result.path);
-                        json alt_geojson = build_geojson(*ds, alt_expanded);
+                        json alt_geojson = include_geojson ? build_geojson(*ds, alt_expanded) : json(nullptr);
                         if (alt_geojson != nullptr && alt_geojson.contains("geometry")) {
                             auto trimmed = trim_geojson_coords(alt_geojson["geometry"]["coordinates"], start_lat, start_lng, end_lat, end_lng);
                             alt_geojson["geometry"]["coordinates"] = trimmed;
@@ -875,6 +879,9 @@ int main(int argc, char* argv[]) {
             std::string algorithm = body.value("algorithm", "pruned");
             bool include_alternative = body.value("include_alternative", false);
             double penalty_factor = body.value("penalty_factor", 2.0);
+            bool include_geojson = body.value("include_geojson", true);
+            // expand=false returns only the shortcut-level path (no expansion/geometry)
+            bool expand_path = body.value("expand", true);
             
             Dataset* ds = get_dataset(dataset_name);
             if (!ds) {
@@ -899,17 +906,18 @@ int main(int argc, char* argv[]) {
             
             json response;
             if (result.reachable) {
-                // Expand shortcut path to base edges
-                auto expanded_path = ds->graph.expand_path(result.path);
+                // Expand shortcut path to base edges (skipped for expand=false)
+                std::vector<uint32_t> expanded_path;
+                if (expand_path) expanded_path = ds->graph.expand_path(result.path);
                 
                 response["success"] = true;
                 response["route"] = {
                     {"distance", result.distance},
-                    {"distance_meters", calculate_distance_meters(*ds, expanded_path)},
+                    {"distance_meters", expand_path ? calculate_distance_meters(*ds, expanded_path) : 0.0},
                     {"runtime_ms", runtime_ms},
-                    {"path", expanded_path},
+                    {"path", expand_path ? json(expanded_path) : json(nullptr)},
                     {"shortcut_path", result.path},
-                    {"geojson", build_geojson(*ds, expanded_path)}
+                    {"geojson", (expand_path && include_geojson) ? build_geojson(*ds, expanded_path) : json(nullptr)}
                 };
                 
                 // If alternative requested, run query_classic_alt with shortest path as penalties
@@ -920,14 +928,15 @@ int main(int argc, char* argv[]) {
                     double alt_runtime_ms = std::chrono::duration<double, std::milli>(alt_end - alt_start).count();
                     
                     if (alt_result.reachable) {
-                        auto alt_expanded = ds->graph.expand_path(alt_result.path);
+                        std::vector<uint32_t> alt_expanded;
+                        if (expand_path) alt_expanded = ds->graph.expand_path(alt_result.path);
                         response["alternative_route"] = {
                             {"distance", alt_result.distance},
-                            {"distance_meters", calculate_distance_meters(*ds, alt_expanded)},
+                            {"distance_meters", expand_path ? calculate_distance_meters(*ds, alt_expanded) : 0.0},
                             {"runtime_ms", alt_runtime_ms},
-                            {"path", alt_expanded},
+                            {"path", expand_path ? json(alt_expanded) : json(nullptr)},
                             {"shortcut_path", alt_result.path},
-                            {"geojson", build_geojson(*ds, alt_expanded)}
+                            {"geojson", (expand_path && include_geojson) ? build_geojson(*ds, alt_expanded) : json(nullptr)}
                         };
                     } else {
                         response["alternative_route"] = nullptr;
@@ -947,6 +956,83 @@ int main(int argc, char* argv[]) {
         }
     });
 
+    // ============================================================
+    // BATCH ROUTE BY EDGE IDs
+    // ============================================================
+    // Answers many (source_edge, target_edge) queries in one request so
+    // clients pay HTTP framing and JSON parsing once instead of per pair.
+    CROW_ROUTE(app, "/route_batch").methods("POST"_method)([](const crow::request& req) {
+        auto start_time = std::chrono::high_resolution_clock::now();
+        
+        try {
+            auto body = json::parse(req.body);
+            std::string dataset_name = body.value("dataset", "default");
+            std::string algorithm = body.value("algorithm", "pruned");
+            bool expand = body.value("expand", true);
+            bool include_geojson = body.value("include_geojson", false);
+            
+            Dataset* ds = get_dataset(dataset_name);
+            if (!ds) {
+                json response = {{"success", false}, {"error", "Dataset '" + dataset_name + "' not loaded"}};
+                return crow::response(503, response.dump());
+            }
+            
+            const auto& queries = body.at("queries");
+            json results = json::array();
+            for (const auto& q : queries) {
+                uint32_t source = q.at("source_edge");
+                uint32_t target = q.at("target_edge");
+                
+                auto q_start = std::chrono::high_resolution_clock::now();
+                QueryResult result;
+                if (algorithm == "classic") {
+                    result = ds->graph.query_classic(source, target);
+                } else if (algorithm == "unidirectional") {
+                    result = ds->graph.query_unidirectional(source, target);
+                } else if (algorithm == "bidijkstra") {
+                    result = ds->graph.query_bidijkstra(source, target);
+                } else {
+                    result = ds->graph.query_pruned(source, target);
+                }
+                auto q_end = std::chrono::high_resolution_clock::now();
+                double q_runtime_ms = std::chrono::duration<double, std::milli>(q_end - q_start).count();
+                
+                if (!result.reachable) {
+                    results.push_back(json{{"success", false}, {"error", "No path found"}, {"runtime_ms", q_runtime_ms}});
+                    continue;
+                }
+                
+                json route = {
+                    {"distance", result.distance},
+                    {"runtime_ms", q_runtime_ms},
+                    {"shortcut_path", result.path}
+                };
+                if (expand) {
+                    auto expanded_path = ds->graph.expand_path(result.path);
+                    route["distance_meters"] = calculate_distance_meters(*ds, expanded_path);
+                    route["geojson"] = include_geojson ? build_geojson(*ds, expanded_path) : json(nullptr);
+                    route["path"] = std::move(expanded_path);
+                }
+                results.push_back(json{{"success", true}, {"route", std::move(route)}});
+            }
+            
+            auto end_time = std::chrono::high_resolution_clock::now();
+            double runtime_ms = std::chrono::duration<double, std::milli>(end_time - start_time).count();
+            
+            json response = {
+                {"success", true},
+                {"dataset", dataset_name},
+                {"results", std::move(results)},
+                {"runtime_ms", runtime_ms}
+            };
+            return crow::response(200, response.dump());
+            
+        } catch (const std::exception& e) {
+            json response = {{"success", false}, {"error", e.what()}};
+            return crow::response(400, response.dump());
+        }
+    });
+
     // ============================================================
     // ROUTE ALTERNATIVE BY EDGE IDs
     // ============================================================
@@ -585,11 +585,15 @@ int main(int argc, char* argv[]) {
                 penalty_factor = body.value("penalty_factor", 2.0);
             }
             
-            // Check expand param (default true for backward compatibility)
+            // Check expand / include_geojson params (default true for backward compatibility)
             bool expand_path = true;
+            bool include_geojson = true;
             if (req.method == "POST"_method) {
                 auto body = json::parse(req.body);
                 expand_path = body.value("expand", true);
+                include_geojson = body.value("include_geojson", true);
+            } else if (req.url_params.get("include_geojson")) {
+                include_geojson = (std::string(req.url_params.get("include_geojson")) == "true");
             }
             
             std::shared_ptr<Dataset> ds = get_dataset(dataset_name);
@@ -689,7 +693,7 @@ int main(int argc, char* argv[]) {
                     expand_us = std::chrono::duration<double, std::micro>(t_expand_end - t_expand_start).count();
                     
                     auto t_geojson_start = std::chrono::high_resolution_clock::now();
-                    geojson = build_geojson(*ds, expanded_path);
+                    if (include_geojson) geojson = build_geojson(*ds, expanded_path);
                     
                     if (geojson != nullptr && geojson.contains("geometry")) {
                         auto trimmed = trim_geojson_coords(geojson["geometry"]["coordinates"], start_lat, start_lng, end_lat, end_lng);
@@ -745,7 +749,7 @@ int main(int argc, char* argv[]) {
                     
                     if (alt_result.reachable) {
                         auto alt_expanded = ds->graph.expand_path(alt_result.path);
-                        json alt_geojson = build_geojson(*ds, alt_expanded);
+                        json alt_geojson = include_geojson ? build_geojson(*ds, alt_expanded) : json(nullptr);
                         if (alt_geojson != nullptr && alt_geojson.contains("geometry")) {
                             auto trimmed = trim_geojson_coords(alt_geojson["geometry"]["coordinates"], start_lat, start_lng, end_lat, end_lng);
                             alt_geojson["geometry"]["coordinates"] = trimmed;
@@ -857,6 +861,83 @@ int main(int argc, char* argv[]) {
         }
     });
 
+    // ============================================================
+    // BATCH ROUTE BY EDGE IDs
+    // ============================================================
+    // Answers many (source_edge, target_edge) queries in one request so
+    // clients pay HTTP framing and JSON parsing once instead of per pair.
+    CROW_ROUTE(app, "/route_batch").methods("POST"_method)([](const crow::request& req) {
+        auto start_time = std::chrono::high_resolution_clock::now();
+        
+        try {
+            auto body = json::parse(req.body);
+            std::string dataset_name = body.value("dataset", "default");
+            std::string algorithm = body.value("algorithm", "pruned");
+            bool expand = body.value("expand", true);
+            bool include_geojson = body.value("include_geojson", false);
+            
+            std::shared_ptr<Dataset> ds = get_dataset(dataset_name);
+            if (!ds) {
+                json response = {{"success", false}, {"error", "Dataset '" + dataset_name + "' not loaded"}};
+                return crow::response(503, response.dump());
+            }
+            
+            const auto& queries = body.at("queries");
+            json results = json::array();
+            for (const auto& q : queries) {
+                uint32_t source = q.at("source_edge");
+                uint32_t target = q.at("target_edge");
+                
+                auto q_start = std::chrono::high_resolution_clock::now();
+                CSRQueryResult result;
+                if (algorithm == "dijkstra") {
+                    result = ds->graph.query_dijkstra(source, target);
+                } else if (algorithm == "classic") {
+                    result = ds->graph.query_classic(source, target);
+                } else if (algorithm == "unidirectional") {
+                    result = ds->graph.query_unidirectional(source, target);
+                } else {
+                    result = ds->graph.query_pruned(source, target);
+                }
+                auto q_end = std::chrono::high_resolution_clock::now();
+                double q_runtime_ms = std::chrono::duration<double, std::milli>(q_end - q_start).count();
+                
+                if (!result.reachable) {
+                    results.push_back(json{{"success", false}, {"error", "No path found"}, {"runtime_ms", q_runtime_ms}});
+                    continue;
+                }
+                
+                json route = {
+                    {"distance", result.distance},
+                    {"runtime_ms", q_runtime_ms},
+                    {"shortcut_path", result.path}
+                };
+                if (expand) {
+                    auto expanded_path = ds->graph.expand_path(result.path);
+                    route["distance_meters"] = calculate_distance_meters(*ds, expanded_path);
+                    route["geojson"] = include_geojson ? build_geojson(*ds, expanded_path) : json(nullptr);
+                    route["path"] = std::move(expanded_path);
+                }
+                results.push_back(json{{"success", true}, {"route", std::move(route)}});
+            }
+            
+            auto end_time = std::chrono::high_resolution_clock::now();
+            double runtime_ms = std::chrono::duration<double, std::milli>(end_time - start_time).count();
+            
+            json response = {
+                {"success", true},
+                {"dataset", dataset_name},
+                {"results", std::move(results)},
+                {"runtime_ms", runtime_ms}
+            };
+            return crow::response(200, response.dump());
+            
+        } catch (const std::exception& e) {
+            json response = {{"success", false}, {"error", e.what()}};
+            return crow::response(400, response.dump());
+        }
+    });
+
     // ============================================================
     // ROUTE ALTERNATIVE BY EDGE IDs
     // ============================================================
@@ -4,47 +4,54 @@ Compare bi_dijkstra_sp with standard dijkstra_sp.
 import sys
 import time
 import random
+import numpy as np
 from routing_algorithms_sp import dijkstra_sp, bi_dijkstra_sp, load_adjacency
 import duckdb
 
+def sample_pairs(edges, n_samples, seed=42):
+    """n_samples random (src, tgt) pairs of distinct edges."""
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < n_samples:
+        src, tgt = rng.choice(edges), rng.choice(edges)
+        if src != tgt:
+            pairs.append((src, tgt))
+    return pairs
+
 def compare_bi_dijkstra(db_path, n_samples=20):
     con = duckdb.connect(db_path, read_only=True)
     fwd_adj, bwd_adj = load_adjacency(con)
-    edges = list(fwd_adj.keys())
+    pairs = sample_pairs(tuple(fwd_adj), n_samples)
     
-    random.seed(42)
-    matches = 0
-    dij_time = 0.0
-    bi_time = 0.0
+    costs = np.zeros((2, n_samples))
+    found = np.zeros((2, n_samples), dtype=bool)
+    dij_ns = 0
+    bi_ns = 0
     
     print(f"Comparing {n_samples} pairs...")
     
-    for i in range(n_samples):
-        src = random.choice(edges)
-        tgt = random.choice(edges)
-        while src == tgt:
-            tgt = random.choice(edges)
-            
-        t0 = time.time()
-        c1, _, ok1 = dijkstra_sp(con, src, tgt, fwd_adj)
-        dij_time += time.time() - t0
+    for i, (src, tgt) in enumerate(pairs):
+        t0 = time.perf_counter_ns()
+        costs[0, i], _, found[0, i] = dijkstra_sp(con, src, tgt, fwd_adj)
+        dij_ns += time.perf_counter_ns() - t0
         
-        t0 = time.time()
-        c2, _, ok2 = bi_dijkstra_sp(con, src, tgt, fwd_adj, bwd_adj)
-        bi_time += time.time() - t0
-        
-        if ok1 and ok2 and abs(c1 - c2) < 0.01:
-            matches += 1
-        elif not ok1 and not ok2:
-            matches += 1
+        t0 = time.perf_counter_ns()
+        costs[1, i], _, found[1, i] = bi_dijkstra_sp(con, src, tgt, fwd_adj, bwd_adj)
+        bi_ns += time.perf_counter_ns() - t0
             
         if (i+1) % 5 == 0:
             print(f"{i+1}/{n_samples} checked")
+    
+    # A pair matches if both found equal costs, or neither found a path
+    both = found[0] & found[1]
+    matches = int(np.sum(both & (np.abs(costs[0] - costs[1]) < 0.01)) + np.sum(~found[0] & ~found[1]))
+    dij_time = dij_ns / 1e6
+    bi_time = bi_ns / 1e6
             
     print(f"\nResults:")
     print(f"Match Rate: {matches}/{n_samples} ({100*matches/n_samples}%)")
-    print(f"Avg Dijkstra Time: {dij_time/n_samples*1000:.2f} ms")
-    print(f"Avg Bi-Dijkstra Time: {bi_time/n_samples*1000:.2f} ms")
+    print(f"Avg Dijkstra Time: {dij_time/n_samples:.2f} ms")
+    print(f"Avg Bi-Dijkstra Time: {bi_time/n_samples:.2f} ms")
     print(f"Speedup: {dij_time/bi_time:.2f}x")
     
     con.close()
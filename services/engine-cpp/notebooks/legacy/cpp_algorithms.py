@@ -26,9 +26,27 @@ Usage:
 from heapq import heappop, heappush
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional, Any
-from collections import defaultdict
+from functools import cached_property, lru_cache
 import math
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        # Without numba the kernels below run as plain (slow) Python
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# Shortcut parquet columns read by load_data (both naming schemes)
+SHORTCUT_COLUMNS = [
+    'from_edge', 'incoming_edge', 'to_edge', 'outgoing_edge',
+    'cost', 'via_edge', 'cell', 'inside',
+]
+
 
 @dataclass
 class QueryResult:
@@ -56,80 +74,181 @@ class Shortcut:
 
 @dataclass
 class AlgorithmData:
-    """Data structures needed by the algorithms."""
-    shortcuts: List[Shortcut]
-    fwd_adj: Dict[int, List[Shortcut]]  # edge_id -> list of shortcuts
-    bwd_adj: Dict[int, List[Shortcut]]  # edge_id -> list of shortcuts
+    """
+    Data structures needed by the algorithms.
+
+    Shortcuts are stored column-wise (one array per field, indexed by
+    shortcut id) with CSR adjacency: fwd_indices[fwd_indptr[e]:fwd_indptr[e + 1]]
+    are the ids of the shortcuts leaving edge e, bwd_* the ones entering it.
+    The Shortcut-object views (shortcuts, fwd_adj, bwd_adj, shortcut_lookup)
+    are built on first access for callers that still use them.
+    """
     edge_meta: Dict[int, dict]  # edge_id -> {'cost', 'lca_res', 'to_cell', 'from_cell'}
-    shortcut_lookup: Dict[int, int]  # (from<<32|to) -> shortcut index
+    n_edges: int             # edge ids are in [0, n_edges)
+    sc_from: np.ndarray      # int32
+    sc_to: np.ndarray        # int32
+    sc_cost: np.ndarray      # float64
+    sc_via: np.ndarray       # int32
+    sc_cell: np.ndarray      # int64 (H3 index, 0 if none)
+    sc_inside: np.ndarray    # int8
+    sc_cell_res: np.ndarray  # int8 (-1 if no cell)
+    fwd_indptr: np.ndarray   # n_edges + 1 offsets into fwd_indices
+    fwd_indices: np.ndarray  # shortcut ids grouped by sc_from
+    bwd_indptr: np.ndarray   # n_edges + 1 offsets into bwd_indices
+    bwd_indices: np.ndarray  # shortcut ids grouped by sc_to
+
+    @cached_property
+    def search_state(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Dense (dist_fwd, dist_bwd, parent_fwd, parent_bwd) reused by query_classic.
+
+        Kept at inf / -1 between queries: each search resets only the slots
+        it touched. Shared per AlgorithmData, so not safe for concurrent
+        query_classic calls on the same data.
+        """
+        return (
+            np.full(self.n_edges, np.inf),
+            np.full(self.n_edges, np.inf),
+            np.full(self.n_edges, -1, dtype=np.int64),
+            np.full(self.n_edges, -1, dtype=np.int64),
+        )
+
+    @cached_property
+    def shortcuts(self) -> List[Shortcut]:
+        return [
+            Shortcut(*row) for row in zip(
+                self.sc_from.tolist(), self.sc_to.tolist(), self.sc_cost.tolist(),
+                self.sc_via.tolist(), self.sc_cell.tolist(), self.sc_inside.tolist(),
+                self.sc_cell_res.tolist(),
+            )
+        ]
+
+    def _adjacency(self, indptr: np.ndarray, indices: np.ndarray) -> Dict[int, List[Shortcut]]:
+        shortcuts = self.shortcuts
+        indices = indices.tolist()
+        return {
+            edge: [shortcuts[i] for i in indices[lo:hi]]
+            for edge, (lo, hi) in enumerate(zip(indptr[:-1].tolist(), indptr[1:].tolist()))
+            if lo < hi
+        }
+
+    @cached_property
+    def fwd_adj(self) -> Dict[int, List[Shortcut]]:  # edge_id -> list of shortcuts
+        return self._adjacency(self.fwd_indptr, self.fwd_indices)
+
+    @cached_property
+    def bwd_adj(self) -> Dict[int, List[Shortcut]]:  # edge_id -> list of shortcuts
+        return self._adjacency(self.bwd_indptr, self.bwd_indices)
+
+    @cached_property
+    def shortcut_lookup(self) -> Dict[int, int]:  # (from<<32|to) -> shortcut index
+        lookup = {}
+        for i, (from_edge, to_edge) in enumerate(zip(self.sc_from.tolist(), self.sc_to.tolist())):
+            lookup.setdefault((from_edge << 32) | to_edge, i)  # keep first
+        return lookup
 
 
 def load_data(shortcuts_path: str, edges_path: str) -> AlgorithmData:
     """Load shortcuts and edges into algorithm data structures."""
+    import pyarrow as pa
     import pyarrow.parquet as pq
     import pandas as pd
-    import h3
-    
-    # Load shortcuts
-    df = pq.read_table(shortcuts_path).to_pandas()
+    import h3.api.basic_int as h3
+    
+    # Load shortcuts (memory-mapped, only the columns used below)
+    available = set(pq.ParquetDataset(shortcuts_path).schema.names)
+    columns = [c for c in SHORTCUT_COLUMNS if c in available]
+    table = pq.read_table(shortcuts_path, columns=columns, memory_map=True)
+    
+    # Narrow edge ids to int32 and the inside flag to int8 (cost and cell
+    # keep their width: cost must match the C++ doubles, cells are 64-bit)
+    narrow = {
+        'from_edge': pa.int32(), 'incoming_edge': pa.int32(),
+        'to_edge': pa.int32(), 'outgoing_edge': pa.int32(),
+        'via_edge': pa.int32(), 'inside': pa.int8(),
+    }
+    table = table.cast(pa.schema([
+        pa.field(f.name, narrow.get(f.name, f.type)) for f in table.schema
+    ]))
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    del table
     
     # Load edges
     edges_df = pd.read_csv(edges_path)
     
-    # Build edge metadata
+    def column(frame, *names):
+        """First present column of ``names`` as an array (0s if none exist)."""
+        for name in names:
+            if name in frame.columns:
+                return frame[name].to_numpy()
+        return np.zeros(len(frame), dtype=np.int64)
+    
+    # Build edge metadata (column lists instead of iterrows: no per-row
+    # Series boxing, and 64-bit cells are not upcast to float)
     edge_meta = {}
-    for _, row in edges_df.iterrows():
-        edge_id = int(row.get('edge_index', row.get('id', 0)))
-        edge_meta[edge_id] = {
-            'cost': float(row['cost']),
-            'lca_res': int(row['lca_res']),
-            'to_cell': int(row.get('to_cell', row.get('incoming_cell', 0))),
-            'from_cell': int(row.get('from_cell', row.get('outgoing_cell', 0))),
+    for edge_id, cost, lca_res, to_cell, from_cell in zip(
+        column(edges_df, 'edge_index', 'id').tolist(),
+        edges_df['cost'].tolist(),
+        edges_df['lca_res'].tolist(),
+        column(edges_df, 'to_cell', 'incoming_cell').tolist(),
+        column(edges_df, 'from_cell', 'outgoing_cell').tolist(),
+    ):
+        edge_meta[int(edge_id)] = {
+            'cost': float(cost),
+            'lca_res': int(lca_res),
+            'to_cell': int(to_cell),
+            'from_cell': int(from_cell),
         }
     
     def get_res(c):
         if c == 0:
             return -1
         try:
-            return h3.get_resolution(h3.int_to_str(c))
+            return h3.get_resolution(c)
         except:
             return -1
     
-    # Build shortcuts and adjacency
-    shortcuts = []
-    fwd_adj = defaultdict(list)
-    bwd_adj = defaultdict(list)
-    shortcut_lookup = {}
+    # Shortcut columns (already narrowed to int32/int8 above)
+    sc_from = column(df, 'from_edge', 'incoming_edge').astype(np.int32, copy=False)
+    sc_to = column(df, 'to_edge', 'outgoing_edge').astype(np.int32, copy=False)
+    sc_cost = df['cost'].to_numpy(np.float64)
+    sc_via = df['via_edge'].to_numpy(np.int32)
+    sc_cell = column(df, 'cell').astype(np.int64, copy=False)
+    sc_inside = df['inside'].to_numpy(np.int8)
+    del df
+    
+    # Resolve each distinct cell once (many shortcuts share a cell)
+    cells, cell_idx = np.unique(sc_cell, return_inverse=True)
+    sc_cell_res = np.array([get_res(c) for c in cells.tolist()], dtype=np.int8)[cell_idx]
+    
+    # CSR adjacency; the stable sort keeps each edge's shortcuts in file order
+    n_edges = 1 + max(
+        int(sc_from.max()) if sc_from.size else -1,
+        int(sc_to.max()) if sc_to.size else -1,
+        max(edge_meta, default=-1),
+    )
     
-    for idx, row in df.iterrows():
-        from_edge = int(row.get('from_edge', row.get('incoming_edge', 0)))
-        to_edge = int(row.get('to_edge', row.get('outgoing_edge', 0)))
-        cell = int(row.get('cell', 0))
-        
-        sc = Shortcut(
-            from_edge=from_edge,
-            to_edge=to_edge,
-            cost=float(row['cost']),
-            via_edge=int(row['via_edge']),
-            cell=cell,
-            inside=int(row['inside']),
-            cell_res=get_res(cell)
-        )
-        shortcuts.append(sc)
-        fwd_adj[from_edge].append(sc)
-        bwd_adj[to_edge].append(sc)
-        
-        # Build lookup (keep first)
-        key = (from_edge << 32) | to_edge
-        if key not in shortcut_lookup:
-            shortcut_lookup[key] = len(shortcuts) - 1
+    def csr(keys):
+        order = np.argsort(keys, kind='stable')
+        indptr = np.searchsorted(keys[order], np.arange(n_edges + 1))
+        return indptr, order
+    
+    fwd_indptr, fwd_indices = csr(sc_from)
+    bwd_indptr, bwd_indices = csr(sc_to)
     
     return AlgorithmData(
-        shortcuts=shortcuts,
-        fwd_adj=dict(fwd_adj),
-        bwd_adj=dict(bwd_adj),
         edge_meta=edge_meta,
-        shortcut_lookup=shortcut_lookup
+        n_edges=n_edges,
+        sc_from=sc_from,
+        sc_to=sc_to,
+        sc_cost=sc_cost,
+        sc_via=sc_via,
+        sc_cell=sc_cell,
+        sc_inside=sc_inside,
+        sc_cell_res=sc_cell_res,
+        fwd_indptr=fwd_indptr,
+        fwd_indices=fwd_indices,
+        bwd_indptr=bwd_indptr,
+        bwd_indices=bwd_indices,
     )
 
 
@@ -142,29 +261,35 @@ def get_edge_cost(edge_id: int, data: AlgorithmData) -> float:
 
 def compute_high_cell(source_edge: int, target_edge: int, data: AlgorithmData) -> HighCell:
     """Compute LCA cell for source and target edges."""
-    import h3
-    
     src_meta = data.edge_meta.get(source_edge, {})
     tgt_meta = data.edge_meta.get(target_edge, {})
     
-    src_cell = src_meta.get('to_cell', 0)
-    tgt_cell = tgt_meta.get('to_cell', 0)
-    src_res = src_meta.get('lca_res', -1)
-    tgt_res = tgt_meta.get('lca_res', -1)
+    return HighCell(*_lca_cell(
+        src_meta.get('to_cell', 0), src_meta.get('lca_res', -1),
+        tgt_meta.get('to_cell', 0), tgt_meta.get('lca_res', -1),
+    ))
+
+
+@lru_cache(maxsize=4096)
+def _lca_cell(src_cell: int, src_res: int, tgt_cell: int, tgt_res: int) -> Tuple[int, int]:
+    """(cell, res) of the lowest common ancestor, or (0, -1).
+
+    Works on 64-bit H3 ints directly; cached because the same source/target
+    pairs repeat across queries.
+    """
+    import h3.api.basic_int as h3
     
     if src_cell == 0 or tgt_cell == 0:
-        return HighCell(0, -1)
+        return 0, -1
     
     # Get cells at their LCA resolutions
     def safe_parent(cell, res):
         if cell == 0 or res < 0:
             return 0
         try:
-            cell_str = h3.int_to_str(cell)
-            cell_res = h3.get_resolution(cell_str)
-            if res > cell_res:
+            if res > h3.get_resolution(cell):
                 return cell
-            return h3.str_to_int(h3.cell_to_parent(cell_str, res))
+            return h3.cell_to_parent(cell, res)
         except:
             return 0
     
@@ -172,139 +297,150 @@ def compute_high_cell(source_edge: int, target_edge: int, data: AlgorithmData) -
     tgt_cell = safe_parent(tgt_cell, tgt_res)
     
     if src_cell == 0 or tgt_cell == 0:
-        return HighCell(0, -1)
+        return 0, -1
     
     # Find LCA
     try:
-        src_str = h3.int_to_str(src_cell)
-        tgt_str = h3.int_to_str(tgt_cell)
-        min_res = min(h3.get_resolution(src_str), h3.get_resolution(tgt_str))
+        min_res = min(h3.get_resolution(src_cell), h3.get_resolution(tgt_cell))
         for res in range(min_res, -1, -1):
-            if h3.cell_to_parent(src_str, res) == h3.cell_to_parent(tgt_str, res):
-                lca = h3.str_to_int(h3.cell_to_parent(src_str, res))
-                return HighCell(lca, res)
+            lca = h3.cell_to_parent(src_cell, res)
+            if lca == h3.cell_to_parent(tgt_cell, res):
+                return lca, res
     except:
         pass
     
-    return HighCell(0, -1)
+    return 0, -1
 
 
 # =============================================================================
 # ALGORITHM 1: query_classic (C++ lines 270-398)
 # =============================================================================
 
-def query_classic(source_edge: int, target_edge: int, data: AlgorithmData) -> QueryResult:
+@njit(cache=True)
+def _query_classic_csr(source, target, target_cost,
+                       fwd_indptr, fwd_indices, bwd_indptr, bwd_indices,
+                       sc_from, sc_to, sc_cost, sc_inside,
+                       dist_fwd, dist_bwd, parent_fwd, parent_bwd):
     """
-    Classic bidirectional Dijkstra with inside filtering only.
-    Direct translation of C++ ShortcutGraph::query_classic.
+    query_classic search over the CSR arrays (numba-compiled when available).
+
+    dist_* / parent_* are dense per-edge arrays that must hold inf / -1 on
+    entry; every slot written is recorded in ``touched`` and restored before
+    returning, so the arrays can be reused without an O(n_edges) refill.
+    Returns (best, meeting, path); meeting is -1 if the target is unreachable.
     """
-    INF = float('inf')
+    touched = [np.int64(source), np.int64(target)]
     
-    if source_edge == target_edge:
-        return QueryResult(get_edge_cost(source_edge, data), [source_edge], True)
+    dist_fwd[source] = 0.0
+    parent_fwd[source] = source
+    pq_fwd = [(0.0, np.int64(source))]
     
-    dist_fwd: Dict[int, float] = {}
-    dist_bwd: Dict[int, float] = {}
-    parent_fwd: Dict[int, int] = {}
-    parent_bwd: Dict[int, int] = {}
-    pq_fwd: List[Tuple[float, int]] = []
-    pq_bwd: List[Tuple[float, int]] = []
+    dist_bwd[target] = target_cost
+    parent_bwd[target] = target
+    pq_bwd = [(target_cost, np.int64(target))]
     
-    dist_fwd[source_edge] = 0.0
-    parent_fwd[source_edge] = source_edge
-    heappush(pq_fwd, (0.0, source_edge))
+    best = np.inf
+    meeting = -1
     
-    target_cost = get_edge_cost(target_edge, data)
-    dist_bwd[target_edge] = target_cost
-    parent_bwd[target_edge] = target_edge
-    heappush(pq_bwd, (target_cost, target_edge))
-    
-    best = INF
-    meeting = None
-    found = False
-    
-    while pq_fwd or pq_bwd:
-        # Forward step
-        if pq_fwd:
+    while len(pq_fwd) > 0 or len(pq_bwd) > 0:
+        # Forward step (stale and pruned entries are skipped)
+        if len(pq_fwd) > 0:
             d, u = heappop(pq_fwd)
             
-            if u in dist_fwd and d > dist_fwd[u]:
-                pass  # stale, continue to bwd
-            elif d >= best:
-                pass  # pruned
-            else:
-                for sc in data.fwd_adj.get(u, []):
-                    if sc.inside != 1:
+            if d <= dist_fwd[u] and d < best:
+                for k in range(fwd_indptr[u], fwd_indptr[u + 1]):
+                    i = fwd_indices[k]
+                    if sc_inside[i] != 1:
                         continue
                     
-                    nd = d + sc.cost
-                    if sc.to_edge not in dist_fwd or nd < dist_fwd[sc.to_edge]:
-                        dist_fwd[sc.to_edge] = nd
-                        parent_fwd[sc.to_edge] = u
-                        heappush(pq_fwd, (nd, sc.to_edge))
+                    v = np.int64(sc_to[i])
+                    nd = d + sc_cost[i]
+                    if nd < dist_fwd[v]:
+                        if parent_fwd[v] < 0:
+                            touched.append(v)
+                        dist_fwd[v] = nd
+                        parent_fwd[v] = u
+                        heappush(pq_fwd, (nd, v))
                         
-                        if sc.to_edge in dist_bwd:
-                            total = nd + dist_bwd[sc.to_edge]
-                            if total < best:
-                                best = total
-                                meeting = sc.to_edge
-                                found = True
+                        total = nd + dist_bwd[v]
+                        if total < best:
+                            best = total
+                            meeting = v
         
         # Backward step
-        if pq_bwd:
+        if len(pq_bwd) > 0:
             d, u = heappop(pq_bwd)
             
-            if u in dist_bwd and d > dist_bwd[u]:
-                pass  # stale
-            elif d >= best:
-                pass  # pruned
-            else:
-                for sc in data.bwd_adj.get(u, []):
-                    if sc.inside != -1 and sc.inside != 0:
+            if d <= dist_bwd[u] and d < best:
+                for k in range(bwd_indptr[u], bwd_indptr[u + 1]):
+                    i = bwd_indices[k]
+                    if sc_inside[i] != -1 and sc_inside[i] != 0:
                         continue
                     
-                    nd = d + sc.cost
-                    if sc.from_edge not in dist_bwd or nd < dist_bwd[sc.from_edge]:
-                        dist_bwd[sc.from_edge] = nd
-                        parent_bwd[sc.from_edge] = u
-                        heappush(pq_bwd, (nd, sc.from_edge))
+                    v = np.int64(sc_from[i])
+                    nd = d + sc_cost[i]
+                    if nd < dist_bwd[v]:
+                        if parent_bwd[v] < 0:
+                            touched.append(v)
+                        dist_bwd[v] = nd
+                        parent_bwd[v] = u
+                        heappush(pq_bwd, (nd, v))
                         
-                        if sc.from_edge in dist_fwd:
-                            total = dist_fwd[sc.from_edge] + nd
-                            if total < best:
-                                best = total
-                                meeting = sc.from_edge
-                                found = True
+                        total = dist_fwd[v] + nd
+                        if total < best:
+                            best = total
+                            meeting = v
         
         # Early termination
-        if pq_fwd and pq_bwd:
+        if len(pq_fwd) > 0 and len(pq_bwd) > 0:
             if pq_fwd[0][0] >= best and pq_bwd[0][0] >= best:
                 break
-        elif not pq_fwd and not pq_bwd:
-            break
     
-    if not found:
-        return QueryResult(-1, [], False)
+    # Reconstruct path (before the parents are reset)
+    path = [np.int64(meeting)]
+    if meeting >= 0:
+        curr = np.int64(meeting)
+        while parent_fwd[curr] >= 0 and parent_fwd[curr] != curr:
+            curr = parent_fwd[curr]
+            path.append(curr)
+        path.reverse()
+        
+        curr = np.int64(meeting)
+        while parent_bwd[curr] >= 0 and parent_bwd[curr] != curr:
+            curr = parent_bwd[curr]
+            path.append(curr)
+    
+    for e in touched:
+        dist_fwd[e] = np.inf
+        dist_bwd[e] = np.inf
+        parent_fwd[e] = -1
+        parent_bwd[e] = -1
+    
+    return best, meeting, path
+
+
+def query_classic(source_edge: int, target_edge: int, data: AlgorithmData) -> QueryResult:
+    """
+    Classic bidirectional Dijkstra with inside filtering only.
+    Direct translation of C++ ShortcutGraph::query_classic.
+    """
+    if source_edge == target_edge:
+        return QueryResult(get_edge_cost(source_edge, data), [source_edge], True)
     
-    # Reconstruct path
-    path = []
-    curr = meeting
+    if not (0 <= source_edge < data.n_edges and 0 <= target_edge < data.n_edges):
+        return QueryResult(-1, [], False)
     
-    while True:
-        path.append(curr)
-        if curr not in parent_fwd or parent_fwd[curr] == curr:
-            break
-        curr = parent_fwd[curr]
-    path.reverse()
+    best, meeting, path = _query_classic_csr(
+        source_edge, target_edge, get_edge_cost(target_edge, data),
+        data.fwd_indptr, data.fwd_indices, data.bwd_indptr, data.bwd_indices,
+        data.sc_from, data.sc_to, data.sc_cost, data.sc_inside,
+        *data.search_state,
+    )
     
-    curr = meeting
-    while True:
-        if curr not in parent_bwd or parent_bwd[curr] == curr:
-            break
-        curr = parent_bwd[curr]
-        path.append(curr)
+    if meeting < 0:
+        return QueryResult(-1, [], False)
     
-    return QueryResult(best, path, True)
+    return QueryResult(float(best), [int(e) for e in path], True)
 
 
 # =============================================================================
@@ -716,17 +852,15 @@ def expand_path(shortcut_path: List[int], data: AlgorithmData) -> List[int]:
     if len(shortcut_path) == 1:
         return [shortcut_path[0]]
     
-    # Build expansion table: (from_edge, to_edge) -> via_edge
-    # Key is the pair, value is the via_edge to expand through
-    expansion_table = {}
-    for sc in data.shortcuts:
-        key = (sc.from_edge, sc.to_edge)
-        if key not in expansion_table:
-            expansion_table[key] = sc.via_edge
+    # (from_edge, to_edge) -> via_edge comes from the shortcut_lookup index
+    # built once in load_data (first occurrence wins), instead of re-scanning
+    # every shortcut on each call.
+    shortcuts = data.shortcuts
+    shortcut_lookup = data.shortcut_lookup
     
     def expand_edge_pair(u: int, v: int, visited: set) -> List[int]:
         """Expand a single edge pair (u, v) to base edges."""
-        key = (u, v)
+        key = (u << 32) | v
         
         # Cycle detection
         if key in visited:
@@ -734,11 +868,12 @@ def expand_path(shortcut_path: List[int], data: AlgorithmData) -> List[int]:
         visited.add(key)
         
         # Look up via_edge for this pair
-        if key not in expansion_table:
+        sc_idx = shortcut_lookup.get(key)
+        if sc_idx is None:
             # No expansion found - this is a base pair
             return [u, v]
         
-        via = expansion_table[key]
+        via = shortcuts[sc_idx].via_edge
         
         # If via equals u or v, can't expand further - base pair
         if via == u or via == v or via == 0:
@@ -14,6 +14,7 @@ Usage:
 
 import duckdb
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 
 # Configuration - change these as needed
@@ -36,20 +37,54 @@ def read_from_parquet():
         print(f"Parquet file not found: {PARQUET_FILE}")
         return None
     
-    # Read parquet with DuckDB (fastest)
-    shortcuts_df = duckdb.read_parquet(str(PARQUET_FILE)).df()
-    print(f"Loaded {len(shortcuts_df):,} shortcuts from parquet")
+    # Query the parquet in place with DuckDB: only the aggregates and sample
+    # rows are materialized in Python, never the full table
+    shortcuts = duckdb.read_parquet(str(PARQUET_FILE))
+    count, min_cost, max_cost, n_from, n_to = shortcuts.aggregate(
+        "COUNT(*), MIN(cost), MAX(cost), COUNT(DISTINCT from_edge), COUNT(DISTINCT to_edge)"
+    ).fetchone()
+    print(f"Loaded {count:,} shortcuts from parquet")
     
     # Basic stats
-    print(f"\nShape: {shortcuts_df.shape}")
-    print(f"Columns: {list(shortcuts_df.columns)}")
-    print(f"\nCost range: {shortcuts_df['cost'].min():.2f} to {shortcuts_df['cost'].max():.2f}")
-    print(f"Unique from_edge: {shortcuts_df['from_edge'].nunique():,}")
-    print(f"Unique to_edge: {shortcuts_df['to_edge'].nunique():,}")
+    print(f"\nShape: ({count}, {len(shortcuts.columns)})")
+    print(f"Columns: {shortcuts.columns}")
+    if count == 0:
+        # MIN/MAX are NULL on an empty table
+        print("\nNo shortcuts in parquet")
+        return shortcuts
+    print(f"\nCost range: {min_cost:.2f} to {max_cost:.2f}")
+    print(f"Unique from_edge: {n_from:,}")
+    print(f"Unique to_edge: {n_to:,}")
     
     print("\nSample rows:")
-    print(shortcuts_df.head())
+    print(shortcuts.limit(5).df())
     
+    # Lazy relation: call .df() only when the whole table is needed
+    return shortcuts
+
+
+def read_edges_of_interest(edges, columns=("from_edge", "to_edge", "via_edge", "cost", "inside")):
+    """
+    Read only the shortcuts that start or end at one of ``edges``.
+
+    The filters are pushed down into the parquet reader, so row groups whose
+    from_edge/to_edge statistics exclude all of ``edges`` are never decoded.
+    The output is sorted by from_edge, which keeps those ranges tight.
+    """
+    if not PARQUET_FILE.exists():
+        print(f"Parquet file not found: {PARQUET_FILE}")
+        return None
+
+    edges = list(edges)
+    # Outer list is OR: from_edge IN edges OR to_edge IN edges
+    table = pq.read_table(
+        PARQUET_FILE,
+        columns=list(columns),
+        memory_map=True,
+        filters=[[("from_edge", "in", edges)], [("to_edge", "in", edges)]],
+    )
+    shortcuts_df = table.to_pandas()
+    print(f"{len(shortcuts_df):,} shortcuts touch edges {edges}")
     return shortcuts_df
 
 
@@ -154,11 +189,11 @@ def find_path(from_edge: int, to_edge: int):
     
     con = duckdb.connect(str(DB_FILE), read_only=True)
     
-    result = con.execute(f"""
+    result = con.execute("""
         SELECT from_edge, to_edge, cost, via_edge
         FROM shortcuts
-        WHERE from_edge = {from_edge} AND to_edge = {to_edge}
-    """).df()
+        WHERE from_edge = ? AND to_edge = ?
+    """, [from_edge, to_edge]).df()
     
     con.close()
     
@@ -179,3 +214,6 @@ if __name__ == "__main__":
     
     # Example: Find specific path (uncomment and set edge IDs)
     # find_path(from_edge=12345, to_edge=67890)
+    
+    # Example: Only the shortcuts around a few edges (parquet filter pushdown)
+    # read_edges_of_interest([12345, 67890])
@@ -517,5 +517,13 @@ def checkpoint(con: duckdb.DuckDBPyConnection) -> None:
     con.execute("CHECKPOINT")
 
 def save_output(con: duckdb.DuckDBPyConnection, output_path: str) -> None:
-    """Save 'shortcuts' table to Parquet."""
-    con.execute(f"COPY shortcuts TO '{output_path}' (FORMAT PARQUET)")
+    """
+    Save 'shortcuts' table to Parquet, sorted by (from_edge, to_edge).
+
+    Sorting keeps every edge's out-shortcuts in one contiguous run (and
+    tightens the parquet row-group statistics on from_edge).
+    """
+    con.execute(f"""
+        COPY (SELECT * FROM shortcuts ORDER BY from_edge, to_edge)
+        TO '{output_path}' (FORMAT PARQUET)
+    """)